@@ -0,0 +1,98 @@
+/* =============== Clientside Bar & Pie Charts ================ */
+
+/*
+  Used when the app runs with CLIENTSIDE_CHARTS=1. The server sends one
+  compact dataset per year (category and exercise codes for every logged
+  set) into the chart-data-cache store, and the bar and pie charts are
+  counted and drawn here. Years already in the cache render without a
+  server round trip, even offline.
+*/
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    charts: {
+
+        // Ask the server for a year's dataset when it isn't cached or has gone stale
+        request_year: function(year, cache, config) {
+            year = year || 'All Time';
+            var entry = (cache || {})[year];
+            if (entry && Date.now() - entry.fetched_at < config.ttl_ms) {
+                return window.dash_clientside.no_update;
+            }
+            return year;
+        },
+
+        // Add a freshly fetched year to the cache
+        merge_dataset: function(response, cache) {
+            if (!response) {
+                return window.dash_clientside.no_update;
+            }
+            var merged = Object.assign({}, cache || {});
+            merged[response.year] = {fetched_at: response.fetched_at, dataset: response.dataset};
+            return merged;
+        },
+
+        // Bar and pie figures for every category, reusing each mounted figure's layout
+        render: function(year, cache, config) {
+            year = year || 'All Time';
+            var categories = config.categories;
+            var figures = Array.prototype.slice.call(arguments, 3);
+            var entry = (cache || {})[year];
+            if (!entry) {
+                return figures.map(function() { return window.dash_clientside.no_update; });
+            }
+            var dataset = entry.dataset;
+
+            // Count logged sets per exercise within each category
+            var counts = {};
+            for (var i = 0; i < dataset.category.length; i++) {
+                var category = dataset.categories[dataset.category[i]];
+                var exercise = dataset.exercises[dataset.exercise[i]];
+                var byExercise = counts[category] = counts[category] || {order: [], count: {}};
+                if (!(exercise in byExercise.count)) {
+                    byExercise.order.push(exercise);
+                    byExercise.count[exercise] = 0;
+                }
+                byExercise.count[exercise] += 1;
+            }
+
+            var outputs = [];
+            categories.forEach(function(category, c) {
+                var byExercise = counts[category] || {order: [], count: {}};
+                var exercises = byExercise.order.slice().sort(function(a, b) {
+                    // Most logged first; ties by name, same as the server charts
+                    return byExercise.count[b] - byExercise.count[a] || (a < b ? -1 : a > b ? 1 : 0);
+                });
+                var values = exercises.map(function(exercise) { return byExercise.count[exercise]; });
+
+                var bar = figures[2 * c];
+                var pie = figures[2 * c + 1];
+
+                outputs.push({
+                    data: exercises.map(function(exercise, i) {
+                        return {
+                            type: 'bar',
+                            name: exercise,
+                            legendgroup: exercise,
+                            offsetgroup: exercise,
+                            x: [values[i]],
+                            y: [exercise],
+                            text: [values[i]]
+                        };
+                    }),
+                    layout: Object.assign({}, bar.layout, {
+                        title: Object.assign({}, bar.layout.title, {text: category + ' Exercise Bar Chart - ' + year}),
+                        yaxis: Object.assign({}, bar.layout.yaxis, {categoryarray: exercises.slice().reverse()})
+                    })
+                });
+
+                outputs.push({
+                    data: [{type: 'pie', labels: exercises, values: values}],
+                    layout: Object.assign({}, pie.layout, {
+                        title: Object.assign({}, pie.layout.title, {text: category + ' Exercise Distribution - ' + year})
+                    })
+                });
+            });
+            return outputs;
+        }
+    }
+});
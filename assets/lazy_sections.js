@@ -0,0 +1,51 @@
+/* ================== Lazy Category Sections =================== */
+
+/*
+  Category sections below the fold aren't rendered until they're about to
+  scroll into view. An IntersectionObserver keeps track of which sections
+  are on screen and clicks the hidden visible-sections-trigger button when
+  that changes; the clientside callback below then flips the per-category
+  <category>-visible stores, which the server-side section callbacks wait on.
+*/
+
+(function() {
+    var onScreen = {};
+    var observed = {};
+
+    // Start loading a section a little before it scrolls into view
+    var observer = new IntersectionObserver(function(entries) {
+        entries.forEach(function(entry) {
+            onScreen[entry.target.id] = entry.isIntersecting;
+        });
+        var trigger = document.getElementById('visible-sections-trigger');
+        if (trigger) {
+            trigger.click();
+        }
+    }, {rootMargin: '200px 0px'});
+
+    // Dash mounts the layout after the page loads, so watch for the sections to appear
+    function observeSections() {
+        document.querySelectorAll('.graph-row[id$="-section"]').forEach(function(section) {
+            if (!observed[section.id]) {
+                observed[section.id] = true;
+                observer.observe(section);
+            }
+        });
+    }
+    new MutationObserver(observeSections).observe(document.documentElement, {childList: true, subtree: true});
+    observeSections();
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        sections: {
+
+            // Visibility flag per category, only updating the ones that changed
+            visible: function(n_clicks, config) {
+                var current = Array.prototype.slice.call(arguments, 2);
+                return config.categories.map(function(category, i) {
+                    var visible = !!onScreen[category.toLowerCase() + '-section'];
+                    return visible === !!current[i] ? window.dash_clientside.no_update : visible;
+                });
+            }
+        }
+    });
+})();
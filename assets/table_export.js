@@ -0,0 +1,25 @@
+/* ======================== Table Export Links ========================= */
+
+/*
+  The CSV and Parquet download links follow the table: same year, same
+  filter row, same sort. /export/<year>.<format> streams the rows on the
+  server, so only the hrefs are computed here.
+*/
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    exports: {
+
+        links: function(year, filterQuery, sortBy) {
+            var query = [];
+            if (filterQuery) {
+                query.push('filter_query=' + encodeURIComponent(filterQuery));
+            }
+            if (sortBy && sortBy.length) {
+                query.push('sort_by=' + encodeURIComponent(JSON.stringify(sortBy)));
+            }
+            var base = '/export/' + encodeURIComponent(year || 'All Time');
+            var search = query.length ? '?' + query.join('&') : '';
+            return [base + '.csv' + search, base + '.parquet' + search];
+        }
+    }
+});
@@ -0,0 +1,193 @@
+# ============================ Figure Template Benchmark ====================== #
+
+# Per-figure build time of the prebuilt line/bar/pie dict builders against
+# the validated go.Figure and Plotly Express paths the dashboard used before.
+# The pytest cases check that both produce the same figure, and that the
+# saved figure_layouts.json is still what figures.py builds.
+#
+#   python benchmarks/bench_figure_templates.py [n_exercises] [repeat]
+#   python -m pytest benchmarks/bench_figure_templates.py
+
+import os
+import sys
+import json
+import timeit
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+from plotly.utils import PlotlyJSONEncoder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figures import make_line_chart, make_bar_chart, make_pie_chart, LINE_TEMPLATE, LAYOUTS_PATH, _build_layouts
+from serialization import dumps_figure
+
+# --------------------------- Reference go / px paths ------------------------- #
+
+def go_line_chart(df_cat, title):
+    fig = go.Figure()
+    for exercise_name, sub in df_cat.groupby('Exercise'):
+        sub_sorted = sub.sort_values('Date')
+        fig.add_trace(
+            go.Scatter(
+                x=sub_sorted['Date'],
+                y=sub_sorted['Weight'],
+                name=str(exercise_name),
+            )
+        )
+    fig.update_layout(
+        template=LINE_TEMPLATE,
+        title=dict(text=title, x=0.5, xanchor='center', font=dict(size=20)),
+        xaxis=dict(tickformat='%m/%d/%Y', title='Date'),
+        yaxis=dict(title='Weight (lbs)'),
+        hovermode='closest',
+        font=dict(size=12),
+        showlegend=True,
+        legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02)
+    )
+    return fig
+
+def px_bar_chart(df_counts, title):
+    return px.bar(
+        df_counts,
+        y="Exercise",
+        x='Count',
+        color="Exercise",
+        text='Count',
+        orientation='h'
+    ).update_layout(
+        title=dict(text=title, x=0.5, font=dict(size=21, family='Calibri', color='black')),
+        font=dict(family='Calibri', size=16, color='black'),
+        yaxis=dict(tickfont=dict(size=16), title=dict(text="Exercise", font=dict(size=16))),
+        xaxis=dict(title=dict(text='Count', font=dict(size=16))),
+        legend=dict(visible=False),
+        hovermode='closest',
+        bargap=0.08,
+        bargroupgap=0
+    ).update_traces(
+        textposition='auto',
+        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
+    )
+
+def px_pie_chart(df_counts, title):
+    return px.pie(
+        df_counts,
+        names="Exercise",
+        values='Count'
+    ).update_layout(
+        title=dict(text=title, x=0.5, font=dict(size=21, family='Calibri', color='black')),
+        font=dict(family='Calibri', size=16, color='black')
+    ).update_traces(
+        rotation=100,
+        texttemplate='%{percent:.1%}',
+        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
+    )
+
+# ---------------------------------- Helpers ---------------------------------- #
+
+# The reference path always draws full-resolution SVG lines
+def dict_line_chart(df_cat, title):
+    return make_line_chart(df_cat, title, webgl_threshold=len(df_cat), max_points=0)
+
+def sample_counts(n_exercises):
+    return pd.DataFrame({
+        'Exercise': [f'EXERCISE {i}' for i in range(n_exercises)],
+        'Count': [n_exercises - i for i in range(n_exercises)],
+    })
+
+def sample_lines(n_exercises, n_dates=60):
+    dates = pd.date_range('2025-01-01', periods=n_dates, freq='D')
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Exercise': np.repeat([f'EXERCISE {i}' for i in range(n_exercises)], n_dates),
+        'Date': np.tile(dates, n_exercises),
+        'Weight': rng.integers(20, 300, n_exercises * n_dates).astype('float64'),
+    })
+
+def deep_merge(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def as_json(fig):
+    """Normalize a figure (go.Figure or dict) to plain JSON for comparison
+
+    Trace defaults held in layout.template.data and the colorway marker
+    colors are applied to the traces the way plotly.js does, so a figure
+    that relies on its template compares equal to one that spells
+    everything out per trace.
+    """
+    if isinstance(fig, go.Figure):
+        fig = fig.to_plotly_json()
+    fig = json.loads(json.dumps(fig, cls=PlotlyJSONEncoder))
+
+    template = fig['layout'].pop('template')
+    colorway = template['layout']['colorway']
+    traces = []
+    for i, trace in enumerate(fig['data']):
+        defaults = template['data'].get(trace['type'], [{}])[0]
+        trace = deep_merge(defaults, trace)
+        if trace['type'] == 'bar':
+            trace = deep_merge({'marker': {'color': colorway[i % len(colorway)].lower()}}, trace)
+            trace['marker']['color'] = trace['marker']['color'].lower()
+        traces.append(trace)
+    fig['data'] = traces
+    return json.loads(json.dumps(fig, sort_keys=True))
+
+def time_per_figure(fn, df, repeat):
+    timer = timeit.Timer(lambda: to_json_plotly(fn(df, 'Push - All Time')))
+    loops, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=loops))
+    return best / loops
+
+# ----------------------------------- Tests ----------------------------------- #
+
+# Same figure either way, so the timings in __main__ compare like with like
+@pytest.mark.parametrize('n_exercises', [1, 12])
+def test_line_chart_matches_go(n_exercises):
+    df_lines = sample_lines(n_exercises)
+    assert as_json(dict_line_chart(df_lines, 't')) == as_json(go_line_chart(df_lines, 't'))
+    assert json.loads(to_json_plotly(dict_line_chart(df_lines, 't'))) == json.loads(to_json_plotly(go_line_chart(df_lines, 't')))
+
+@pytest.mark.parametrize('n_exercises', [1, 12])
+@pytest.mark.parametrize('make_chart, reference_chart', [(make_bar_chart, px_bar_chart), (make_pie_chart, px_pie_chart)])
+def test_count_chart_matches_px(make_chart, reference_chart, n_exercises):
+    df_counts = sample_counts(n_exercises)
+    assert as_json(make_chart(df_counts, 't')) == as_json(reference_chart(df_counts, 't'))
+
+def test_saved_layouts_current():
+    with open(LAYOUTS_PATH, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved == json.loads(dumps_figure(_build_layouts())), 'figure_layouts.json is out of date, rerun python figures.py'
+
+# ----------------------------------- Main ------------------------------------ #
+
+if __name__ == '__main__':
+    n_exercises = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    warnings.simplefilter('ignore', FutureWarning)
+    df_counts = sample_counts(n_exercises)
+    df_lines = sample_lines(n_exercises)
+
+    # Timings include serialization, which both paths pay per request
+    print(f"Exercises per figure: {n_exercises}")
+    for kind, reference_fn, template_fn, df in [
+        ('line', go_line_chart, dict_line_chart, df_lines),
+        ('bar', px_bar_chart, make_bar_chart, df_counts),
+        ('pie', px_pie_chart, make_pie_chart, df_counts),
+    ]:
+        reference_time = time_per_figure(reference_fn, df, repeat)
+        template_time = time_per_figure(template_fn, df, repeat)
+        print(
+            f"{kind}: go/px {reference_time * 1e3:8.3f} ms | dict {template_time * 1e3:8.3f} ms "
+            f"| {reference_time / template_time:6.1f}x"
+        )
@@ -0,0 +1,48 @@
+# ============================= Import Time Budget ============================ #
+
+# Cold-start regression checks: a fresh interpreter importing the app (what
+# every worker boot or restart pays) must stay within
+# IMPORT_TIME_BUDGET_SECONDS and must not pull in the modules that are only
+# imported on first use. When either fails, benchmarks/import_report.py shows
+# where the time went.
+#
+#   python -m pytest benchmarks/bench_import_time.py
+#   IMPORT_TIME_BUDGET_SECONDS=1 python -m pytest benchmarks/bench_import_time.py
+
+import os
+import json
+import subprocess
+import sys
+
+from import_report import ROOT, MODULE, cold_import_seconds
+
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv('IMPORT_TIME_BUDGET_SECONDS', '1.5'))
+
+# Imported when first needed (sign-in, exports, shared data, figure template
+# rebuilds, background jobs), or not at all
+DEFERRED_MODULES = [
+    'seaborn',
+    'requests',
+    'gspread',
+    'google.oauth2.service_account',
+    'plotly.express',
+    'pyarrow.parquet',
+    'filelock',
+    'redis',
+    'diskcache',
+]
+
+def test_cold_import_within_budget():
+    # Nothing the app imports is cached between runs apart from bytecode, which
+    # only the first may still be writing; a busy machine can slow any one run,
+    # so the best of three counts
+    seconds = min(cold_import_seconds() for _ in range(3))
+    assert seconds <= IMPORT_TIME_BUDGET_SECONDS, (
+        f'import {MODULE} took {seconds:.2f}s, over the {IMPORT_TIME_BUDGET_SECONDS:.2f}s budget '
+        '(python benchmarks/import_report.py shows where it goes)'
+    )
+
+def test_deferred_modules_not_imported():
+    code = f'import json, sys, {MODULE}; print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))'
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
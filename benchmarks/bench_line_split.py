@@ -0,0 +1,69 @@
+# ============================== Line Split Benchmark ========================= #
+
+# Per-category line chart build time with the old groupby + per-exercise sort
+# against the single sort / split-by-boundaries path, with and without the
+# sorted store get_year_data keeps.
+#
+#   python benchmarks/bench_line_split.py [exercises_per_category] [dates]
+
+import os
+import sys
+import json
+
+import numpy as np
+from plotly.io.json import to_json_plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figures import make_line_chart, lttb_indices, LINE_LAYOUT, LINE_MAX_POINTS, SCATTERGL_THRESHOLD
+from bench_parallel_render import CATEGORIES, synthetic_long, best_of
+
+# ------------------------------ Reference path ------------------------------- #
+
+def groupby_line_chart(df_cat, title):
+    """make_line_chart as it was: one groupby and one sort per exercise"""
+    series = []
+    for exercise_name, sub in df_cat.groupby('Exercise'):
+        sub_sorted = sub.sort_values('Date')
+        if LINE_MAX_POINTS and len(sub_sorted) > LINE_MAX_POINTS:
+            keep = lttb_indices(
+                sub_sorted['Date'].to_numpy(dtype='datetime64[ns]').astype(np.int64),
+                sub_sorted['Weight'].to_numpy(),
+                LINE_MAX_POINTS,
+            )
+            sub_sorted = sub_sorted.iloc[keep]
+        series.append((exercise_name, sub_sorted))
+
+    n_points = sum(len(sub) for _, sub in series)
+    trace_type = 'scattergl' if n_points > SCATTERGL_THRESHOLD else 'scatter'
+    traces = [
+        {'type': trace_type, 'x': sub['Date'], 'y': sub['Weight'], 'name': str(exercise_name)}
+        for exercise_name, sub in series
+    ]
+    return {'data': traces, 'layout': {**LINE_LAYOUT, 'title': {**LINE_LAYOUT['title'], 'text': title}}}
+
+# ----------------------------------- Main ------------------------------------ #
+
+if __name__ == '__main__':
+    exercises_per_category = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    n_dates = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+    # Rows arrive in date order, as the melted sheet does
+    df_long = synthetic_long(exercises_per_category, n_dates)
+    by_category = [df_long[df_long['Category'] == category].reset_index(drop=True) for category in CATEGORIES]
+
+    df_sorted = df_long.sort_values(['Category', 'Exercise', 'Date'], kind='stable').reset_index(drop=True)
+    sorted_slices = [df_sorted[df_sorted['Category'] == category] for category in CATEGORIES]
+
+    # Same figures every way, so the timings below compare like with like
+    for df_cat, df_slice in zip(by_category, sorted_slices):
+        expected = json.loads(to_json_plotly(groupby_line_chart(df_cat, 't')))
+        assert json.loads(to_json_plotly(make_line_chart(df_cat, 't'))) == expected
+        assert json.loads(to_json_plotly(make_line_chart(df_slice, 't', presorted=True))) == expected
+
+    print(f"{len(df_long):,} rows, {len(CATEGORIES) * exercises_per_category} exercises, {n_dates} dates each")
+    groupby = best_of(lambda: [groupby_line_chart(df_cat, 't') for df_cat in by_category])
+    single_sort = best_of(lambda: [make_line_chart(df_cat, 't') for df_cat in by_category])
+    presorted = best_of(lambda: [make_line_chart(df_slice, 't', presorted=True) for df_slice in sorted_slices])
+    for name, elapsed in [('groupby + sorts', groupby), ('single sort', single_sort), ('presorted store', presorted)]:
+        print(f"{name:<16} {elapsed * 1e3:9.1f} ms | {groupby / elapsed:6.1f}x")
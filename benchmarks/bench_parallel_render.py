@@ -0,0 +1,101 @@
+# ============================ Parallel Render Benchmark ====================== #
+
+# Each category section has its own callback, which builds that category's
+# line, bar and pie figures. Times one category built inline (what the app
+# does) against fanning its three charts out to a thread or process pool, and
+# a whole year's categories built serially against fanning them out to a
+# thread or process pool, as prewarm and background loads do with
+# FIGURE_WORKERS > 1 (thread pool times also stand for the section callbacks
+# running concurrently under a threaded server).
+#
+#   python benchmarks/bench_parallel_render.py [exercises_per_category] [dates] [max_workers]
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from figures import build_category_figures
+
+CATEGORIES = ['Push', 'Pull', 'Leg', 'Bicep', 'Tricep', 'Shoulder', 'Ab', 'Calisthenics', 'Forearm', 'Cardio']
+
+def synthetic_long(exercises_per_category, n_dates, seed=0):
+    """Cleaned long frame shaped like preprocess_data output"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01', periods=n_dates, freq='D')
+    frames = []
+    for category in CATEGORIES:
+        for i in range(exercises_per_category):
+            frames.append(pd.DataFrame({
+                'Category': category,
+                'Exercise': f'{category.upper()} EXERCISE {i}',
+                'Date': dates,
+                'Weight': np.round(50 + np.cumsum(rng.normal(0.2, 2, n_dates)), 1),
+            }))
+    return pd.concat(frames, ignore_index=True).sort_values('Date', kind='stable').reset_index(drop=True)
+
+KINDS = ('graph', 'bar', 'pie')
+
+def category_frames(df_long):
+    """Each category's rows ordered by (Exercise, Date), like category_slice"""
+    return [
+        (df_long[df_long['Category'] == category].sort_values(['Exercise', 'Date'], kind='stable').reset_index(drop=True), category)
+        for category in CATEGORIES
+    ]
+
+def build_inline(df_cat, category):
+    return build_category_figures(df_cat, category, 'All Time', KINDS, presorted=True)
+
+def build_on_pool(pool, df_cat, category):
+    """The former render_category fan-out: one pool task per chart kind"""
+    built = {}
+    tasks = [(df_cat, category, 'All Time', (kind,), True) for kind in KINDS]
+    for figures in pool.map(build_category_figures, *zip(*tasks)):
+        built.update(figures)
+    return built
+
+def per_category(fn, frames):
+    """Mean time of fn for one category"""
+    return best_of(lambda: [fn(df_cat, category) for df_cat, category in frames]) / len(frames)
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+if __name__ == '__main__':
+    exercises_per_category = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    n_dates = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+
+    df_long = synthetic_long(exercises_per_category, n_dates)
+    frames = category_frames(df_long)
+    print(f"{len(df_long):,} rows, {len(CATEGORIES)} categories, {os.cpu_count()} CPUs")
+
+    inline = per_category(build_inline, frames)
+    print(f"one category, inline          {inline * 1e3:8.1f} ms")
+    for name, executor_cls in [('thread', ThreadPoolExecutor), ('process', ProcessPoolExecutor)]:
+        with executor_cls(max_workers=len(KINDS)) as pool:
+            # Warm the pool so worker start-up isn't counted
+            build_on_pool(pool, *frames[0])
+            elapsed = per_category(lambda df_cat, category: build_on_pool(pool, df_cat, category), frames)
+        print(f"one category, {name:<7} pool x{len(KINDS)} {elapsed * 1e3:8.1f} ms | {inline / elapsed:5.2f}x")
+
+    serial = best_of(lambda: [build_inline(df_cat, category) for df_cat, category in frames])
+    print(f"\nall categories, serial        {serial * 1e3:8.1f} ms")
+    for name, executor_cls in [('thread', ThreadPoolExecutor), ('process', ProcessPoolExecutor)]:
+        workers = 2
+        while workers <= max_workers:
+            with executor_cls(max_workers=workers) as pool:
+                list(pool.map(build_inline, *zip(*frames[:workers])))
+                elapsed = best_of(lambda: list(pool.map(build_inline, *zip(*frames))))
+            print(f"all categories, {name:<7} x{workers:<2} {elapsed * 1e3:8.1f} ms | {serial / elapsed:5.2f}x")
+            workers *= 2
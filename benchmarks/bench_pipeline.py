@@ -0,0 +1,116 @@
+# ============================= Pipeline Benchmarks =========================== #
+
+# pytest-benchmark cases for each stage of a year switch against a synthetic
+# workbook: sheet load, wide-to-long preprocessing, the line/bar/pie builders
+# and every dashboard callback request end to end. Results are saved as JSON
+# under .benchmarks/ so runs from different commits can be compared:
+#
+#   python -m pytest benchmarks/bench_pipeline.py --benchmark-autosave
+#   python -m pytest benchmarks/bench_pipeline.py --benchmark-json=bench.json
+#   pytest-benchmark compare 0001 0002
+#
+# Scale with BENCH_EXERCISES (40), BENCH_DATES (150), BENCH_YEARS
+# (2024,2025,2026) and BENCH_FILL (0.35).
+
+import pytest
+
+from dash_requests import year_switch_payloads
+from figures import make_line_chart, make_bar_chart, make_pie_chart
+from table_query import table_page, TABLE_PAGE_SIZE
+
+YEARS = ['2025', 'All Time']
+
+def largest_category(app_module, year_data):
+    return max(year_data['category_rows'], key=lambda category: len(app_module.category_slice(year_data, category)))
+
+# --------------------------------- Loading ----------------------------------- #
+
+@pytest.mark.parametrize('year', YEARS)
+def test_load_data_for_year(benchmark, app_module, year):
+    df = benchmark(app_module.load_data_for_year, year)
+    assert not df.empty
+
+@pytest.mark.parametrize('year', YEARS)
+def test_preprocess_data(benchmark, app_module, year):
+    df_year = app_module.load_data_for_year(year)
+    df_long = benchmark(app_module.preprocess_data, df_year)
+    assert len(df_long) > 0
+
+@pytest.mark.parametrize('year', YEARS)
+def test_summarize_year(benchmark, app_module, year):
+    benchmark(app_module.summarize_year, app_module.clean_year(year))
+
+def test_refresh_unchanged(benchmark, app_module):
+    year_data = app_module.get_year_data('All Time')
+    df_sorted = app_module.clean_year('All Time')
+    refreshed = benchmark(app_module.refresh_year_data, 'All Time', df_sorted)
+    assert refreshed['df_sorted'] is year_data['df_sorted']
+    assert refreshed['loaded_at'] >= year_data['loaded_at']
+
+    df_sorted.loc[0, 'Weight'] += 1
+    assert app_module.refresh_year_data('All Time', df_sorted)['df_sorted'] is df_sorted
+
+# --------------------------------- Figures ----------------------------------- #
+
+@pytest.mark.parametrize('presorted', [True, False])
+def test_make_line_chart(benchmark, app_module, presorted):
+    year_data = app_module.get_year_data('All Time')
+    category = largest_category(app_module, year_data)
+    df_cat = app_module.category_slice(year_data, category)
+    if not presorted:
+        df_cat = df_cat.sample(frac=1, random_state=0)
+    fig = benchmark(make_line_chart, df_cat, f'{category} Progress Over Time - All Time', presorted=presorted)
+    assert fig['data']
+
+@pytest.mark.parametrize('kind', ['bar', 'pie'])
+def test_count_charts(benchmark, app_module, kind):
+    year_data = app_module.get_year_data('All Time')
+    df_cat = app_module.category_slice(year_data, largest_category(app_module, year_data))
+    df_counts = df_cat['Exercise'].value_counts().reset_index()
+    df_counts.columns = ['Exercise', 'Count']
+    make_chart = make_bar_chart if kind == 'bar' else make_pie_chart
+    fig = benchmark(make_chart, df_counts, 'Exercise Counts - All Time')
+    assert fig['data']
+
+# ---------------------------------- Table ------------------------------------ #
+
+TABLE_QUERIES = [
+    '',
+    '{Exercise} icontains bench && {Weight} >= 135',
+    '{Date} datestartswith 2025-03',
+    '{Category} = Push && {Date} > 2024-06-01',
+]
+
+@pytest.mark.parametrize('filter_query', TABLE_QUERIES)
+def test_table_query(benchmark, app_module, filter_query):
+    """A page of the All Time table filtered and sorted by weight, with no cached result"""
+    index = app_module.get_year_data('All Time')['table_index']
+    sort_by = [{'column_id': 'Weight', 'direction': 'desc'}]
+
+    def page():
+        index.clear()
+        return table_page(index, 2, TABLE_PAGE_SIZE, sort_by, filter_query)
+
+    benchmark(page)
+
+# -------------------------------- Dashboard ---------------------------------- #
+
+def switch_year(client, payloads):
+    for payload in payloads:
+        response = client.post('/_dash-update-component', json=payload)
+        assert response.status_code == 200, response.get_data(as_text=True)[:500]
+
+@pytest.mark.parametrize('year', YEARS)
+def test_dashboard_cold(benchmark, app_module, clear_caches, year):
+    """Every callback of a year switch with nothing cached (sheet fetch included)"""
+    client = app_module.server.test_client()
+    payloads = year_switch_payloads(app_module.app, year)
+    benchmark.pedantic(switch_year, args=(client, payloads), setup=clear_caches, rounds=5, iterations=1)
+
+@pytest.mark.parametrize('year', YEARS)
+def test_dashboard_warm(benchmark, app_module, year):
+    """Every callback of a year switch with the year's data and figures cached"""
+    client = app_module.server.test_client()
+    payloads = year_switch_payloads(app_module.app, year)
+    switch_year(client, payloads)
+    benchmark(switch_year, client, payloads)
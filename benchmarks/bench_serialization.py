@@ -0,0 +1,66 @@
+# =========================== Serialization Benchmarks ======================== #
+
+# The json and orjson engines on the JSON work of an All Time year switch:
+# encoding freshly built figures for the figure cache, and turning cached
+# figure entries into one response with every section's figure patches plus the
+# table, encoded the way Dash encodes callback responses.
+#
+#   python -m pytest benchmarks/bench_serialization.py --benchmark-group-by=func
+
+import pytest
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+
+import serialization
+from figures import make_line_chart, make_bar_chart, make_pie_chart, figure_entry
+from table_query import table_page
+
+YEAR = 'All Time'
+
+@pytest.fixture(params=['json', 'orjson'])
+def engine(request, monkeypatch):
+    if request.param == 'orjson' and serialization.orjson is None:
+        pytest.skip('orjson is not installed')
+    monkeypatch.setattr(serialization, 'JSON_ENGINE', request.param)
+    monkeypatch.setattr(pio.json.config, 'default_engine', request.param)
+    return request.param
+
+def all_time_figures(app_module):
+    year_data = app_module.get_year_data(YEAR)
+    figures = []
+    for category in year_data['category_rows']:
+        df_cat = app_module.category_slice(year_data, category)
+        df_counts = df_cat['Exercise'].value_counts().reset_index()
+        df_counts.columns = ['Exercise', 'Count']
+        figures += [
+            make_line_chart(df_cat, f'{category} Progress Over Time - {YEAR}', presorted=True),
+            make_bar_chart(df_counts, f'{category} Exercise Bar Chart - {YEAR}'),
+            make_pie_chart(df_counts, f'{category} Exercise Distribution - {YEAR}'),
+        ]
+    return figures
+
+def test_dump_figures(benchmark, app_module, engine):
+    """Every All Time figure encoded for the figure cache"""
+    figures = all_time_figures(app_module)
+    encoded = benchmark(lambda: [figure_entry(fig) for fig in figures])
+    assert all(encoded)
+
+def test_all_time_response(benchmark, app_module, engine):
+    """Cached figure entries to one encoded response holding every section and the table"""
+    year_data = app_module.get_year_data(YEAR)
+    categories = list(year_data['category_rows'])
+    for category in categories:
+        app_module.cached_figures(year_data, category, YEAR)
+
+    def respond():
+        response = {}
+        for category in categories:
+            prefix = category.lower()
+            for kind, patch in zip(app_module.SERVER_CHART_KINDS, app_module.category_figures(year_data, category, YEAR)):
+                response[f'{prefix}-{kind}'] = {'figure': patch}
+        records, _, _ = table_page(year_data['table_index'])
+        response['applications-table'] = {'data': serialization.preencoded(records), 'columns': year_data['table_columns']}
+        return to_json_plotly({'multi': True, 'response': response})
+
+    body = benchmark(respond)
+    assert serialization.loads(body)['response']
@@ -0,0 +1,112 @@
+# ============================ Table Query Parity ============================= #
+
+# TableIndex (searchsorted range scans, factorized text columns) against a
+# plain pandas evaluation of the same filter_query and sort_by, the way the
+# table was filtered before it was indexed: random combinations over the
+# synthetic All Time table, plus dates outside what datetime64[ns] can hold.
+#
+#   python -m pytest benchmarks/bench_table_query.py
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from table_query import parse_filter
+
+COMBINATIONS = 400
+
+OUT_OF_RANGE_DATES = ['3000-01-01', '1500-01-01', '0001-01-01', '9999-12-31', '2262-04-12', '1677-09-21']
+
+def reference_part(df, column, operator_name, value):
+    series = df[column]
+    if operator_name in ('contains', 'icontains'):
+        return series.astype(str).str.contains(value, case=operator_name == 'contains', regex=False).to_numpy()
+    if operator_name == 'datestartswith':
+        return series.astype(str).str.startswith(value).to_numpy()
+
+    if column == 'Date':
+        try:
+            value = pd.Timestamp(value)
+        except ValueError:
+            return np.zeros(len(df), dtype=bool)
+    elif column in ('#', 'Weight'):
+        try:
+            value = float(value)
+        except ValueError:
+            return np.zeros(len(df), dtype=bool)
+    elif operator_name.startswith('i'):
+        series, value = series.str.lower(), value.lower()
+
+    comparisons = {'eq': np.equal, 'ne': np.not_equal, 'lt': np.less, 'le': np.less_equal, 'gt': np.greater, 'ge': np.greater_equal}
+    return np.asarray(comparisons[operator_name.lstrip('i')](series, value), dtype=bool)
+
+def reference_query(df, filter_query, sort_by):
+    mask = np.ones(len(df), dtype=bool)
+    for column, operator_name, value in parse_filter(filter_query):
+        mask &= reference_part(df, column, operator_name, value)
+    # The index may hold rows in any order; the table lists them by '#'
+    rows = df[mask].sort_values('#', kind='stable')
+    if sort_by:
+        rows = rows.sort_values(
+            [item['column_id'] for item in sort_by],
+            ascending=[item['direction'] != 'desc' for item in sort_by],
+            kind='stable',
+        )
+    return rows.index.to_numpy()
+
+def random_part(rng, df):
+    column = rng.choice(list(df.columns))
+    sample = df[column].iloc[rng.randrange(len(df))]
+    if column == 'Date':
+        operator_name = rng.choice(['=', '!=', '<', '<=', '>', '>=', 'datestartswith', 'contains'])
+        if operator_name == 'datestartswith':
+            value = rng.choice([sample.strftime('%Y'), sample.strftime('%Y-%m'), sample.strftime('%Y-%m-%d'), '3000', '1500', '2262', '1677'])
+        elif rng.random() < 0.25:
+            value = rng.choice(OUT_OF_RANGE_DATES)
+        else:
+            value = (sample + pd.Timedelta(days=rng.choice([-1, 0, 0, 1]))).strftime('%Y-%m-%d')
+    elif column in ('#', 'Weight'):
+        operator_name = rng.choice(['=', '!=', '<', '<=', '>', '>=', 'contains'])
+        value = str(sample + rng.choice([-5, 0, 0, 2.5]))
+    else:
+        operator_name = rng.choice(['contains', 'icontains', '=', 'ieq', '!=', 'ine', '<', '>=', 'datestartswith'])
+        value = sample[:rng.randrange(1, len(sample) + 1)]
+        if operator_name.startswith('i'):
+            value = value.lower()
+    return f'{{{column}}} {operator_name} {value}'
+
+def random_query(rng, df):
+    filter_query = ' && '.join(random_part(rng, df) for _ in range(rng.randint(1, 3)))
+    sort_by = [
+        {'column_id': column, 'direction': rng.choice(['asc', 'desc'])}
+        for column in rng.sample(list(df.columns), rng.randint(0, 2))
+    ]
+    return filter_query, sort_by
+
+@pytest.fixture(scope='module')
+def table_index(app_module):
+    return app_module.get_year_data('All Time')['table_index']
+
+def test_random_queries_match_pandas(table_index):
+    df = table_index.df
+    rng = random.Random(46)
+    for _ in range(COMBINATIONS):
+        filter_query, sort_by = random_query(rng, df)
+        table_index.clear()
+        rows = table_index.query(filter_query, sort_by)
+        np.testing.assert_array_equal(rows, reference_query(df, filter_query, sort_by), err_msg=f'{filter_query} {sort_by}')
+
+@pytest.mark.parametrize('date', OUT_OF_RANGE_DATES)
+@pytest.mark.parametrize('operator_name', ['=', '!=', '<', '<=', '>', '>=', 'datestartswith'])
+def test_out_of_range_dates_match_pandas(table_index, operator_name, date):
+    df = table_index.df
+    filter_query = f'{{Date}} {operator_name} {date}'
+    np.testing.assert_array_equal(table_index.query(filter_query), reference_query(df, filter_query, []))
+
+@pytest.mark.parametrize('column_id', [[1], {'a': 1}, None, 'Missing'])
+def test_invalid_sort_columns_are_ignored(table_index, column_id):
+    df = table_index.df
+    sort_by = [{'column_id': column_id, 'direction': 'desc'}, {'column_id': 'Weight', 'direction': 'asc'}]
+    np.testing.assert_array_equal(table_index.query('', sort_by), reference_query(df, '', sort_by[1:]))
@@ -0,0 +1,34 @@
+# ============================ Benchmark Fixtures ============================ #
+
+# Serves a synthetic workbook (scaled by BENCH_EXERCISES, BENCH_DATES,
+# BENCH_YEARS and BENCH_FILL) through the gspread stub, then imports the app
+# once for the whole session.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_sheets import synthetic_workbook, scale_from_env, install_stub
+
+WORKBOOK = synthetic_workbook(**scale_from_env())
+install_stub(WORKBOOK)
+
+@pytest.fixture(scope='session')
+def app_module():
+    import jason_fitness_tracker
+    return jason_fitness_tracker
+
+@pytest.fixture(scope='session')
+def workbook():
+    return WORKBOOK
+
+@pytest.fixture
+def clear_caches(app_module):
+    """Function that drops every cached year and figure, for cold-path rounds"""
+    def clear():
+        app_module._year_data.clear()
+        app_module.figure_cache.backend.clear()
+    return clear
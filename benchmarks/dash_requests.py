@@ -0,0 +1,42 @@
+# ============================== Dash Requests =============================== #
+
+# The /_dash-update-component request bodies the browser sends when a year is
+# picked in year-dropdown: the header, every category section (as if on
+# screen) and the table.
+
+YEAR_INPUTS = {('year-dropdown', 'value'), ('loaded-year', 'data')}
+
+def _parse_outputs(output):
+    """Output ids and properties from a callback_map key ('..a.children...b.figure..' or 'a.figure@hash')"""
+    if output.startswith('..'):
+        parts = output[2:-2].split('...')
+    else:
+        parts = [output.split('@')[0]]
+    return [{'id': part.rsplit('.', 1)[0], 'property': part.rsplit('.', 1)[1]} for part in parts]
+
+def _value(component_id, prop, year):
+    if (component_id, prop) in YEAR_INPUTS:
+        return year
+    if component_id.endswith('-visible'):
+        return True
+    return None
+
+def year_switch_payloads(app, year):
+    """Request bodies for every server callback fired by choosing year"""
+    payloads = []
+    for output, callback in app.callback_map.items():
+        inputs = callback['inputs']
+        # Clientside callbacks run in the browser and have no server function
+        if 'callback' not in callback:
+            continue
+        if not any((item['id'], item['property']) in YEAR_INPUTS for item in inputs):
+            continue
+        outputs = _parse_outputs(output)
+        payloads.append({
+            'output': output,
+            'outputs': outputs if output.startswith('..') else outputs[0],
+            'inputs': [{**item, 'value': _value(item['id'], item['property'], year)} for item in inputs],
+            'changedPropIds': [f"{item['id']}.{item['property']}" for item in inputs if (item['id'], item['property']) in YEAR_INPUTS],
+            'state': [{**item, 'value': _value(item['id'], item['property'], year)} for item in callback['state']],
+        })
+    return payloads
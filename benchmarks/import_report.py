@@ -0,0 +1,103 @@
+# ================================ Import Report ============================== #
+
+# Where a cold `import jason_fitness_tracker` spends its time, from
+# `python -X importtime` in a fresh interpreter. Importing the app signs in to
+# nothing and fetches nothing, so no credentials or stub are needed and this
+# is what every gunicorn worker (or the preloading master) pays on boot.
+#
+#   python benchmarks/import_report.py
+#   python benchmarks/import_report.py --runs 5 --top 30 --json import_report.json
+#
+# Reports the median of --runs imports: the total, the app's direct imports
+# by cumulative time, and the modules with the most time of their own.
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = 'jason_fitness_tracker'
+
+def _run(code, importtime=False):
+    command = [sys.executable, *(['-X', 'importtime'] if importtime else []), '-c', code]
+    return subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+
+def cold_import_seconds(module=MODULE):
+    """Wall time of importing module in a fresh interpreter"""
+    code = f'import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)'
+    return float(_run(code).stdout.strip().splitlines()[-1])
+
+def import_times(module=MODULE):
+    """(module, depth, self seconds, cumulative seconds) for every import under module, in import order"""
+    stderr = _run(f'import {module}', importtime=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), depth, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+def report(runs=3, top=20, module=MODULE):
+    """The run with the median total out of runs, summarized"""
+    samples = []
+    for _ in range(runs):
+        rows = import_times(module)
+        total = next(cumulative for name, _, _, cumulative in rows if name == module)
+        samples.append((total, rows))
+    samples.sort(key=lambda sample: sample[0])
+    total, rows = samples[len(samples) // 2]
+
+    # importtime lists a module after everything it imported, so the app's
+    # imports are the deeper rows right before it (the rest is interpreter startup)
+    end = next(i for i, row in enumerate(rows) if row[0] == module)
+    app_depth = rows[end][1]
+    start = end
+    while start > 0 and rows[start - 1][1] > app_depth:
+        start -= 1
+    app_rows = rows[start:end + 1]
+    return {
+        'module': module,
+        'runs': runs,
+        'total_seconds': round(total, 4),
+        'totals_seconds': [round(sample[0], 4) for sample in samples],
+        'direct_imports': [
+            {'module': name, 'cumulative_seconds': round(cumulative, 4)}
+            for name, depth, _, cumulative in sorted(app_rows, key=lambda row: -row[3])
+            if depth == app_depth + 1
+        ][:top],
+        'self_time': [
+            {'module': name, 'self_seconds': round(self_seconds, 4)}
+            for name, _, self_seconds, _ in sorted(app_rows, key=lambda row: -row[2])
+        ][:top],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold import time report for the dashboard app')
+    parser.add_argument('--runs', type=int, default=3, help='imports to take the median of')
+    parser.add_argument('--top', type=int, default=20, help='modules to list per table')
+    parser.add_argument('--json', help='write the report to this file')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = report(args.runs, args.top)
+
+    print(f"import {result['module']}: {result['total_seconds'] * 1e3:.0f} ms (median of {result['runs']}: {', '.join(f'{t * 1e3:.0f}' for t in result['totals_seconds'])} ms)")
+    print('\nDirect imports by cumulative time')
+    for row in result['direct_imports']:
+        print(f"  {row['cumulative_seconds'] * 1e3:8.1f} ms  {row['module']}")
+    print('\nModules by own time')
+    for row in result['self_time']:
+        print(f"  {row['self_seconds'] * 1e3:8.1f} ms  {row['module']}")
+    print(f'\n({time.perf_counter() - started:.1f}s)')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+# ================================= Load Test ================================= #
+
+# Boots the offline app (synthetic workbook, no Google Sheets) under gunicorn
+# and has N simulated users switch years over and over. Every switch posts the
+# header, section and table callbacks to /_dash-update-component, the same
+# bodies the browser sends. Reports throughput, latency percentiles, error
+# rate, startup time and memory for each gunicorn workers x threads x preload
+# setting. Memory is each worker's RSS and unique (USS) memory, plus the PSS
+# of the master and workers together, which counts pages they share once.
+#
+#   python benchmarks/loadtest.py --users 8 --duration 20 --workers 1 2 4 --threads 1 4
+#   python benchmarks/loadtest.py --users 16 --json loadtest.json
+#   python benchmarks/loadtest.py --workers 1 2 4 --preload 0 1
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import subprocess
+import threading
+
+import numpy as np
+import psutil
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+GUNICORN_CONF = os.path.join(os.path.dirname(BENCH_DIR), 'gunicorn.conf.py')
+sys.path.insert(0, BENCH_DIR)
+
+from dash_requests import year_switch_payloads
+
+# ------------------------------ Server control ------------------------------- #
+
+def start_server(workers, threads, port, extra_args, preload=False):
+    """gunicorn serving offline_app with the app's gunicorn.conf.py, once it answers requests"""
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '--config', GUNICORN_CONF,
+        '--chdir', BENCH_DIR,
+        '--workers', str(workers),
+        '--threads', str(threads),
+        '--bind', f'127.0.0.1:{port}',
+        '--timeout', '120',
+        *extra_args,
+        'offline_app:server',
+    ]
+    env = {**os.environ, 'PRELOAD_APP': '1' if preload else '0'}
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env)
+
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 120
+    try:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited:\n{process.stderr.read()}')
+            # Workers only appear once the master holds the port, so this also
+            # rules out answers from some other server left on it
+            if len(psutil.Process(process.pid).children()) >= workers:
+                try:
+                    if requests.get(url + '/', timeout=5).ok:
+                        return process, url
+                except requests.RequestException:
+                    # Still importing the app
+                    pass
+            time.sleep(0.5)
+        raise RuntimeError('gunicorn did not start within 120s')
+    except BaseException:
+        stop_server(process)
+        raise
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def memory_usage(process):
+    """(rss, uss) of each gunicorn worker by pid, and the PSS of the master and workers together"""
+    master = psutil.Process(process.pid)
+    workers = {}
+    total_pss = 0
+    for member in [master, *master.children()]:
+        try:
+            info = member.memory_full_info()
+        except psutil.NoSuchProcess:
+            continue
+        total_pss += info.pss
+        if member.pid != master.pid:
+            workers[member.pid] = (info.rss, info.uss)
+    return workers, total_pss
+
+# --------------------------------- Users ------------------------------------- #
+
+def simulated_user(url, switches, stop_at, results, lock):
+    """Switch years until stop_at, recording every request and every whole switch"""
+    session = requests.Session()
+    request_times, switch_times, errors = [], [], 0
+    for payloads in itertools.cycle(switches):
+        if time.monotonic() >= stop_at:
+            break
+        switch_start = time.perf_counter()
+        for payload in payloads:
+            start = time.perf_counter()
+            try:
+                response = session.post(url + '/_dash-update-component', json=payload, timeout=120)
+                if response.status_code not in (200, 204):
+                    errors += 1
+            except requests.RequestException:
+                errors += 1
+            request_times.append(time.perf_counter() - start)
+        switch_times.append(time.perf_counter() - switch_start)
+
+    with lock:
+        results['request_times'] += request_times
+        results['switch_times'] += switch_times
+        results['errors'] += errors
+
+def run_load(url, switches, users, duration, process):
+    results = {'request_times': [], 'switch_times': [], 'errors': 0}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    # Stagger users across the years so they don't all hit the same cache entry
+    threads = [
+        threading.Thread(target=simulated_user, args=(url, switches[i % len(switches):] + switches[:i % len(switches)], stop_at, results, lock))
+        for i in range(users)
+    ]
+    peak_rss, peak_uss, peak_pss = {}, {}, 0
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        workers, total_pss = memory_usage(process)
+        for pid, (rss, uss) in workers.items():
+            peak_rss[pid] = max(peak_rss.get(pid, 0), rss)
+            peak_uss[pid] = max(peak_uss.get(pid, 0), uss)
+        peak_pss = max(peak_pss, total_pss)
+        time.sleep(0.5)
+    elapsed = time.perf_counter() - start
+
+    request_times = np.array(results['request_times'])
+    switch_times = np.array(results['switch_times'])
+    n_requests = len(request_times)
+    return {
+        'requests': n_requests,
+        'switches': len(switch_times),
+        'requests_per_second': n_requests / elapsed,
+        'switches_per_second': len(switch_times) / elapsed,
+        'error_rate': results['errors'] / n_requests if n_requests else 0.0,
+        'request_ms': dict(zip(('p50', 'p95', 'p99'), (np.percentile(request_times, [50, 95, 99]) * 1e3).round(1).tolist())) if n_requests else {},
+        'switch_ms': dict(zip(('p50', 'p95', 'p99'), (np.percentile(switch_times, [50, 95, 99]) * 1e3).round(1).tolist())) if len(switch_times) else {},
+        'worker_rss_mb': sorted(round(rss / 2**20, 1) for rss in peak_rss.values()),
+        'worker_uss_mb': sorted(round(uss / 2**20, 1) for uss in peak_uss.values()),
+        'total_pss_mb': round(peak_pss / 2**20, 1),
+    }
+
+# ---------------------------------- Main ------------------------------------- #
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the dashboard callbacks on an offline gunicorn server')
+    parser.add_argument('--users', type=int, default=8, help='concurrent simulated users')
+    parser.add_argument('--duration', type=float, default=20, help='seconds per setting')
+    parser.add_argument('--years', nargs='+', default=['All Time', '2024', '2025', '2026'])
+    parser.add_argument('--workers', nargs='+', type=int, default=[1], help='gunicorn worker counts to sweep')
+    parser.add_argument('--threads', nargs='+', type=int, default=[1], help='gunicorn thread counts to sweep')
+    parser.add_argument('--preload', nargs='+', type=int, choices=[0, 1], default=[0], help='PRELOAD_APP settings to sweep')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--gunicorn-arg', action='append', default=[], help='extra gunicorn argument (repeatable)')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    # Request bodies come from the same app the server runs
+    import offline_app
+    switches = [year_switch_payloads(offline_app.app, year) for year in args.years]
+
+    runs = []
+    for workers, threads, preload in itertools.product(args.workers, args.threads, args.preload):
+        started = time.perf_counter()
+        process, url = start_server(workers, threads, args.port, args.gunicorn_arg, preload=bool(preload))
+        startup_seconds = time.perf_counter() - started
+        try:
+            # One pass over every year so the first timed switch isn't a cold start
+            for payloads in switches:
+                for payload in payloads:
+                    requests.post(url + '/_dash-update-component', json=payload, timeout=120)
+            result = {
+                'workers': workers, 'threads': threads, 'preload': bool(preload), 'users': args.users,
+                'startup_seconds': round(startup_seconds, 2),
+                **run_load(url, switches, args.users, args.duration, process),
+            }
+        finally:
+            stop_server(process)
+        runs.append(result)
+        print(
+            f"workers={workers:<2} threads={threads:<2} preload={preload} users={args.users:<3} startup {startup_seconds:.1f}s | "
+            f"{result['requests_per_second']:7.1f} req/s {result['switches_per_second']:6.2f} switches/s | "
+            f"request p50/p95/p99 {result['request_ms'].get('p50', 0):.0f}/{result['request_ms'].get('p95', 0):.0f}/{result['request_ms'].get('p99', 0):.0f} ms | "
+            f"switch p95 {result['switch_ms'].get('p95', 0):.0f} ms | errors {result['error_rate']:.1%} | "
+            f"worker RSS {result['worker_rss_mb']} MB, USS {result['worker_uss_mb']} MB | total PSS {result['total_pss_mb']} MB"
+        )
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(runs, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+# ================================ Offline App ================================ #
+
+# The dashboard served from a synthetic workbook instead of Google Sheets, for
+# load tests. Scale it with BENCH_EXERCISES, BENCH_DATES, BENCH_YEARS and
+# BENCH_FILL.
+#
+#   gunicorn --chdir benchmarks offline_app:server -w 2 --threads 4
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_sheets import synthetic_workbook, scale_from_env, install_stub
+
+install_stub(synthetic_workbook(**scale_from_env()))
+
+from jason_fitness_tracker import app, server  # noqa: E402
@@ -0,0 +1,113 @@
+# ============================= Synthetic Sheets ============================== #
+
+# Jason_<year>-shaped wide worksheets (Category, Exercise, then one column per
+# workout date) at a configurable scale, and a stand-in for the gspread client
+# that serves them, so the app can be imported and driven without Google
+# credentials or network access.
+#
+#   from synthetic_sheets import synthetic_workbook, install_stub
+#   install_stub(synthetic_workbook(exercises=200, dates=150))
+#   import jason_fitness_tracker
+
+import os
+import sys
+import json
+import base64
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ['Push', 'Pull', 'Leg', 'Bicep', 'Tricep', 'Shoulder', 'Ab', 'Calisthenics', 'Forearm', 'Cardio']
+
+def synthetic_workbook(exercises=40, dates=150, years=('2024', '2025', '2026'), fill=0.35, seed=0, name='Jason'):
+    """Worksheet title -> get_all_records() rows for each year
+
+    exercises are spread evenly over the categories, dates are workout days
+    spaced through each year, and fill is the share of exercise/date cells
+    holding a weight (the rest are blank, as in the real sheet).
+    """
+    rng = np.random.default_rng(seed)
+    workbook = {}
+    for year in years:
+        days = pd.date_range(f'{year}-01-01', f'{year}-12-31', freq='D')
+        workout_days = days[np.linspace(0, len(days) - 1, min(dates, len(days))).astype(int)]
+        date_columns = [day.strftime('%m/%d/%Y') for day in workout_days]
+
+        rows = []
+        for i in range(exercises):
+            category = CATEGORIES[i % len(CATEGORIES)]
+            # A slow upward trend in 5 lb steps, like real progress
+            weights = np.round((40 + rng.integers(0, 150) + np.cumsum(rng.normal(0.3, 2.0, len(date_columns)))) / 5) * 5
+            logged = rng.random(len(date_columns)) < fill
+            row = {'Category': category, 'Exercise': f'{category.upper()} EXERCISE {i}'}
+            row.update({
+                column: int(weight) if is_logged else ''
+                for column, weight, is_logged in zip(date_columns, weights, logged)
+            })
+            rows.append(row)
+        workbook[f'{name}_{year}'] = rows
+    return workbook
+
+def scale_from_env():
+    """Workbook scale from BENCH_EXERCISES, BENCH_DATES, BENCH_YEARS and BENCH_FILL"""
+    return {
+        'exercises': int(os.getenv('BENCH_EXERCISES', '40')),
+        'dates': int(os.getenv('BENCH_DATES', '150')),
+        'years': tuple(os.getenv('BENCH_YEARS', '2024,2025,2026').split(',')),
+        'fill': float(os.getenv('BENCH_FILL', '0.35')),
+    }
+
+# ================================ gspread Stub =============================== #
+
+class StubWorksheet:
+    def __init__(self, title, records):
+        self.title = title
+        self._records = records
+
+    def get_all_records(self):
+        return [dict(record) for record in self._records]
+
+class StubSpreadsheet:
+    def __init__(self, workbook):
+        self._workbook = workbook
+
+    def worksheet(self, title):
+        import gspread
+        if title not in self._workbook:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return StubWorksheet(title, self._workbook[title])
+
+    def worksheets(self):
+        return [StubWorksheet(title, records) for title, records in self._workbook.items()]
+
+class StubHTTPClient:
+    def __init__(self):
+        import requests
+        self.session = requests.Session()
+
+class StubClient:
+    def __init__(self, workbook):
+        self._workbook = workbook
+        self.http_client = StubHTTPClient()
+
+    def open_by_url(self, url):
+        return StubSpreadsheet(self._workbook)
+
+    open_by_key = open = open_by_url
+
+def install_stub(workbook):
+    """Make the app's service-account login and gspread.authorize serve workbook instead of Google Sheets
+
+    Call before importing jason_fitness_tracker.
+    """
+    import gspread
+    from google.oauth2 import service_account
+
+    os.environ['GOOGLE_CREDENTIALS'] = base64.b64encode(json.dumps({}).encode()).decode()
+    service_account.Credentials.from_service_account_info = classmethod(lambda cls, info, **kwargs: object())
+    gspread.authorize = lambda credentials, *args, **kwargs: StubClient(workbook)
+
+    # The app lives in the repository root
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
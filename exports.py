@@ -0,0 +1,74 @@
+# =================================== IMPORTS ================================= #
+
+import os
+
+# ================================== Exports ================================== #
+
+# /export/<year>.csv and /export/<year>.parquet stream a year's table rows in
+# the order and with the filter the table shows. Rows are converted
+# EXPORT_CHUNK_ROWS at a time and each chunk is sent as soon as it is encoded,
+# so memory stays flat and the download starts straight away.
+
+EXPORT_CHUNK_ROWS = int(os.getenv('EXPORT_CHUNK_ROWS', '5000'))
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+def _chunks(rows):
+    for start in range(0, len(rows), EXPORT_CHUNK_ROWS):
+        yield rows[start:start + EXPORT_CHUNK_ROWS]
+
+def csv_chunks(df, rows):
+    """CSV text for df's rows at positions rows, header first, one chunk at a time"""
+    yield df.iloc[:0].to_csv(index=False)
+    for chunk in _chunks(rows):
+        yield df.iloc[chunk].to_csv(index=False, header=False)
+
+class _ChunkSink:
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    closed = False
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+def parquet_chunks(df, rows):
+    """A Parquet file of df's rows at positions rows, one row group per chunk"""
+    # pyarrow is only loaded once someone exports Parquet
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Text columns need a row to be typed as strings rather than nulls
+    schema = pa.Schema.from_pandas(df.iloc[:1], preserve_index=False)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(rows):
+            writer.write_table(pa.Table.from_pandas(df.iloc[chunk], schema=schema, preserve_index=False))
+            yield sink.drain()
+    # The footer is written on close
+    yield sink.drain()
+
+def export_chunks(fmt, df, rows):
+    return csv_chunks(df, rows) if fmt == 'csv' else parquet_chunks(df, rows)
@@ -0,0 +1,191 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# ================================ Figure Cache =============================== #
+
+# Serialized figures keyed by (year, category, chart kind, data version), each
+# stored as the two JSON lines of figures.figure_entry: what a patch needs from
+# the layout, then the traces.
+# The data version is a hash of the category's rows, so a sheet edit only
+# misses (and evicts) the categories it actually touched.
+
+def _key_name(key):
+    """Filesystem-safe name for a (year, category, kind, version) key"""
+    return '__'.join(re.sub(r'[^A-Za-z0-9_.-]', '_', str(part)) for part in key)
+
+class MemoryBackend:
+    """In-process LRU of figure entry strings bounded by total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = value
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def delete_stale(self, year, category, version):
+        with self._lock:
+            for key in [k for k in self._entries if k[:2] == (year, category) and k[3] != version]:
+                self._size -= len(self._entries.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+class DiskBackend:
+    """LRU of figure entry files in a directory bounded by total size
+
+    Several gunicorn workers can share the directory; each keeps its own
+    recency index and treats a file another worker evicted as a miss.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # Rebuild the recency order from file modification times
+        files = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith('.jsonl'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        self._index = OrderedDict((name, size) for _, name, size in sorted(files))
+        self._size = sum(self._index.values())
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def get(self, key):
+        name = _key_name(key) + '.jsonl'
+        try:
+            with open(self._path(name), encoding='utf-8') as f:
+                value = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._index.pop(name, 0)
+            return None
+        with self._lock:
+            if name in self._index:
+                self._index.move_to_end(name)
+        return value
+
+    def put(self, key, value):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        name = _key_name(key) + '.jsonl'
+
+        # Write then rename so readers never see a partial file
+        tmp_path = self._path(f'.{name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(value)
+        os.replace(tmp_path, self._path(name))
+
+        with self._lock:
+            self._size += size - self._index.pop(name, 0)
+            self._index[name] = size
+            while self._size > self.max_bytes and self._index:
+                evicted, evicted_size = self._index.popitem(last=False)
+                self._size -= evicted_size
+                try:
+                    os.remove(self._path(evicted))
+                except FileNotFoundError:
+                    pass
+
+    def delete_stale(self, year, category, version):
+        prefix = _key_name((year, category)) + '__'
+        current = '__' + _key_name((version,)) + '.jsonl'
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.startswith(prefix) and entry.name.endswith('.jsonl') and not entry.name.endswith(current):
+                    self._size -= self._index.pop(entry.name, 0)
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+    def clear(self):
+        with self._lock:
+            for name in self._index:
+                try:
+                    os.remove(self._path(name))
+                except FileNotFoundError:
+                    pass
+            self._index.clear()
+            self._size = 0
+
+class FigureCache:
+    """Figure entry cache keyed by (year, category, kind, data version)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def update_versions(self, year, versions):
+        """Record the current data version per category and drop figures built from older data"""
+        with self._lock:
+            stale = [
+                category for category, version in versions.items()
+                if self._versions.get((year, category), version) != version
+            ]
+            for category, version in versions.items():
+                self._versions[(year, category)] = version
+        for category in stale:
+            self.backend.delete_stale(year, category, versions[category])
+        return stale
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.backend.put(key, value)
+
+def create_figure_cache(default_backend='memory'):
+    """Figure cache configured from FIGURE_CACHE_BACKEND, FIGURE_CACHE_MAX_MB and FIGURE_CACHE_DIR"""
+    backend_name = os.getenv('FIGURE_CACHE_BACKEND', default_backend).lower()
+    max_bytes = int(float(os.getenv('FIGURE_CACHE_MAX_MB', '64')) * 1024 * 1024)
+
+    if backend_name == 'disk':
+        directory = os.getenv('FIGURE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.figure_cache'))
+        backend = DiskBackend(directory, max_bytes)
+    elif backend_name == 'memory':
+        backend = MemoryBackend(max_bytes)
+    else:
+        raise ValueError(f"Unknown FIGURE_CACHE_BACKEND: {backend_name!r} (expected 'memory' or 'disk')")
+
+    return FigureCache(backend)
@@ -0,0 +1,395 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import json
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+
+from serialization import dumps_figure, dumps_split
+from timing import timed
+
+# ============================== Figure Templates ============================= #
+
+# The bar and pie charts share the same fonts, titles and hover templates on
+# every request. They are built (and validated) once through Plotly Express
+# and kept as plain dicts; each request only fills in the data arrays and
+# title text, so no Plotly validation runs per figure. Treat everything below
+# as read-only.
+
+_sample_counts = pd.DataFrame({'Exercise': ['Exercise'], 'Count': [1]})
+
+def _bar_template():
+    import plotly.express as px
+
+    return px.bar(
+        _sample_counts,
+        y="Exercise",
+        x='Count',
+        color="Exercise",
+        text='Count',
+        orientation='h',
+        # color_discrete_sequence=px.colors.qualitative.Vivid
+    ).update_layout(
+        title=dict(
+            text='',
+            x=0.5,
+            font=dict(size=21,
+            family='Calibri',
+            color='black')
+        ),
+        font=dict(
+            family='Calibri',
+            size=16,
+            color='black'
+        ),
+        yaxis=dict(
+            tickfont=dict(size=16),
+            title=dict(
+                text="Exercise",
+                font=dict(size=16)
+            )
+        ),
+        xaxis=dict(
+            title=dict(
+                text='Count',
+                font=dict(size=16)
+            )
+        ),
+        legend=dict(visible=False),
+        hovermode='closest',
+        bargap=0.08,
+        bargroupgap=0
+    ).update_traces(
+        textposition='auto',
+        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
+    ).to_plotly_json()
+
+def _pie_template():
+    import plotly.express as px
+
+    return px.pie(
+        _sample_counts,
+        names="Exercise",
+        values='Count'
+    ).update_layout(
+        title=dict(
+            text='',
+            x=0.5,
+            font=dict(
+                size=21,
+                family='Calibri',
+                color='black'
+            )
+        ),
+        font=dict(
+            family='Calibri',
+            size=16,
+            color='black'
+        )
+    ).update_traces(
+        rotation=100,
+        texttemplate='%{percent:.1%}',
+        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
+    ).to_plotly_json()
+
+def _deep_merge(base, override):
+    """Nested dict merge where values from override win"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def _with_trace_defaults(layout, trace_type, defaults):
+    """Copy of a layout whose template applies defaults to every trace of trace_type"""
+    template = layout['template']
+    template_traces = template['data'].get(trace_type, [{}])
+    return {
+        **layout,
+        'template': {
+            **template,
+            'data': {
+                **template['data'],
+                trace_type: [_deep_merge(template_traces[0], defaults)],
+            },
+        },
+    }
+
+# Styling shared by every trace lives in layout.template.data, so the traces
+# themselves only carry names and data. A year switch can then swap the data
+# of a mounted figure without resending fonts and hover templates.
+_BAR_TRACE_KEYS = ('type', 'name', 'legendgroup', 'offsetgroup', 'x', 'y', 'text')
+_PIE_TRACE_KEYS = ('type', 'labels', 'values')
+
+# Progress lines get the same treatment for both the SVG and WebGL trace
+# types, and their layout is likewise validated once and reused as a dict
+_LINE_TRACE_DEFAULTS = dict(
+    mode='lines+markers',
+    hovertemplate='Exercise: <b>%{fullData.name}</b><br>Date: <b>%{x|%m/%d/%Y}</b><br>Weight: <b>%{y} lbs.</b><extra></extra>',
+)
+
+@lru_cache(maxsize=None)
+def line_template():
+    """Plotly template carrying the progress line trace defaults"""
+    template = go.layout.Template(pio.templates['plotly'])
+    template.data.scatter = [go.Scatter(template.data.scatter[0], **_LINE_TRACE_DEFAULTS)]
+    template.data.scattergl = [go.Scattergl(**_LINE_TRACE_DEFAULTS)]
+    return template
+
+def _build_layouts():
+    """Bar, pie and line layouts, validated through Plotly"""
+    bar_template = _bar_template()
+    bar_trace = bar_template['data'][0]
+    pie_template = _pie_template()
+    pie_trace = pie_template['data'][0]
+
+    return {
+        'bar': _with_trace_defaults(
+            bar_template['layout'],
+            'bar',
+            {
+                **{k: v for k, v in bar_trace.items() if k not in _BAR_TRACE_KEYS + ('marker',)},
+                'marker': {k: v for k, v in bar_trace['marker'].items() if k != 'color'},
+            },
+        ),
+        'pie': _with_trace_defaults(
+            pie_template['layout'],
+            'pie',
+            {k: v for k, v in pie_trace.items() if k not in _PIE_TRACE_KEYS},
+        ),
+        'line': go.Figure().update_layout(
+            template=line_template(),
+            title=dict(text='', x=0.5, xanchor='center', font=dict(size=20)),
+            xaxis=dict(tickformat='%m/%d/%Y', title='Date'),
+            yaxis=dict(title='Weight (lbs)'),
+            hovermode='closest',
+            font=dict(size=12),
+            showlegend=True,
+            legend=dict(
+                orientation="v",
+                yanchor="top",
+                y=1,
+                xanchor="left",
+                x=1.02
+            )
+        ).to_plotly_json()['layout'],
+    }
+
+# Building the layouts imports Plotly Express and validates three figures,
+# about a third of a cold start, while every import needs them to mount the
+# empty charts. They are kept built in figure_layouts.json next to this file;
+# run `python figures.py` to rewrite it after changing the builders above or
+# upgrading Plotly (benchmarks/bench_figure_templates.py fails until then).
+LAYOUTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'figure_layouts.json')
+
+def write_layouts(path=LAYOUTS_PATH):
+    """Build the layouts through Plotly and save them to path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(json.loads(dumps_figure(_build_layouts())), f, indent=1, sort_keys=True)
+        f.write('\n')
+
+def _load_layouts():
+    try:
+        with open(LAYOUTS_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return _build_layouts()
+
+_LAYOUTS = _load_layouts()
+BAR_LAYOUT = _LAYOUTS['bar']
+PIE_LAYOUT = _LAYOUTS['pie']
+LINE_LAYOUT = _LAYOUTS['line']
+
+def __getattr__(name):
+    # LINE_TEMPLATE is only built when something asks for it
+    if name == 'LINE_TEMPLATE':
+        return line_template()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Line charts switch from SVG Scatter to WebGL Scattergl once a category has
+# more points than this, so long All Time histories stay responsive
+SCATTERGL_THRESHOLD = int(os.getenv('SCATTERGL_THRESHOLD', '1000'))
+
+# Cap on points per exercise trace; longer series are downsampled with LTTB.
+# Set to 0 to always send every point.
+LINE_MAX_POINTS = int(os.getenv('LINE_MAX_POINTS', '500'))
+
+# ================================ Downsampling =============================== #
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the points Largest-Triangle-Three-Buckets keeps out of x/y"""
+    n = len(x)
+    if n_out <= 0 or n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    sizes = ends - starts
+
+    # Average point of every bucket, used as the third corner of the triangle
+    avg_x = np.add.reduceat(x[:n - 1], starts) / sizes
+    avg_y = np.add.reduceat(y[:n - 1], starts) / sizes
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - next_x[i]) * (by - y[a]) - (x[a] - bx) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+# ============================== Figure Builders ============================== #
+
+def make_bar_chart(df_counts: pd.DataFrame, title: str) -> dict:
+    """Horizontal exercise count bar chart from the prebuilt bar template"""
+    exercises = df_counts['Exercise'].tolist()
+    counts = df_counts['Count'].tolist()
+
+    # Bar colors come from the template colorway, one per trace as in px
+    traces = [
+        {
+            'type': 'bar',
+            'name': exercise,
+            'legendgroup': exercise,
+            'offsetgroup': exercise,
+            'x': [count],
+            'y': [exercise],
+            'text': [float(count)],
+        }
+        for exercise, count in zip(exercises, counts)
+    ]
+
+    layout = {
+        **BAR_LAYOUT,
+        'title': {**BAR_LAYOUT['title'], 'text': title},
+        'yaxis': {**BAR_LAYOUT['yaxis'], 'categoryarray': exercises[::-1]},
+    }
+    return {'data': traces, 'layout': layout}
+
+def make_pie_chart(df_counts: pd.DataFrame, title: str) -> dict:
+    """Exercise distribution pie chart from the prebuilt pie template"""
+    trace = {
+        'type': 'pie',
+        'labels': df_counts['Exercise'].tolist(),
+        'values': df_counts['Count'].tolist(),
+    }
+    layout = {**PIE_LAYOUT, 'title': {**PIE_LAYOUT['title'], 'text': title}}
+    return {'data': [trace], 'layout': layout}
+
+def make_line_chart(
+    df_cat: pd.DataFrame,
+    title: str,
+    webgl_threshold: int | None = None,
+    max_points: int | None = None,
+    presorted: bool = False,
+) -> dict:
+    """Exercise progress line chart from the prebuilt line layout, one trace per exercise
+
+    Pass presorted=True when df_cat is already ordered by (Exercise, Date) to
+    skip the sort.
+    """
+    if webgl_threshold is None:
+        webgl_threshold = SCATTERGL_THRESHOLD
+    if max_points is None:
+        max_points = LINE_MAX_POINTS
+
+    if not presorted:
+        df_cat = df_cat.sort_values(['Exercise', 'Date'], kind='stable')
+
+    # Each exercise is one contiguous run, so its trace is a view between two boundaries
+    exercises = df_cat['Exercise'].to_numpy()
+    dates = df_cat['Date'].to_numpy(dtype='datetime64[ns]').astype('datetime64[s]')
+    weights = df_cat['Weight'].to_numpy(dtype='float64')
+    boundaries = np.flatnonzero(exercises[1:] != exercises[:-1]) + 1
+    names = exercises[np.concatenate(([0], boundaries))] if len(exercises) else []
+
+    series = []
+    for exercise_name, x, y in zip(names, np.split(dates, boundaries), np.split(weights, boundaries)):
+        if max_points and len(x) > max_points:
+            keep = lttb_indices(x.astype(np.int64), y, max_points)
+            x, y = x[keep], y[keep]
+        series.append((exercise_name, x, y))
+
+    # One trace type for the whole figure so legend and hover behave the same
+    n_points = sum(len(x) for _, x, _ in series)
+    trace_type = 'scattergl' if n_points > webgl_threshold else 'scatter'
+
+    traces = [
+        {
+            'type': trace_type,
+            'x': x,
+            'y': y,
+            'name': str(exercise_name),
+        }
+        for exercise_name, x, y in series
+    ]
+
+    layout = {**LINE_LAYOUT, 'title': {**LINE_LAYOUT['title'], 'text': title}}
+    return {'data': traces, 'layout': layout}
+
+# ============================= Category Rendering ============================ #
+
+# Plotly imports its JSON engine on first use; do it here so request and
+# render pool threads don't race on a half-imported module
+to_json_plotly({'data': [], 'layout': {}})
+
+def figure_entry(fig: dict) -> str:
+    """What patching a mounted copy of fig sends, as kept in the figure cache
+
+    The title (and the bar chart's category order) on one JSON line and the
+    traces on the next, so serving the entry only parses the first line.
+    """
+    layout = fig['layout']
+    head = {'title': layout['title']['text']}
+    if 'categoryarray' in layout.get('yaxis', {}):
+        head['categoryarray'] = layout['yaxis']['categoryarray']
+    return dumps_split(head, fig['data'])
+
+def build_category_figures(df_cat: pd.DataFrame, category: str, selected_year: str, kinds=('graph', 'bar', 'pie'), presorted=False) -> dict:
+    """Figure cache entries (figure_entry) for one category's line, bar and pie charts, keyed by chart kind
+
+    Kept at module level (and free of Dash state) so it can run in a process pool.
+    """
+    figures = {}
+
+    if 'graph' in kinds:
+        with timed('figure_build', category=category, kind='graph'):
+            fig = make_line_chart(df_cat, f'{category} Progress Over Time - {selected_year}', presorted=presorted)
+        with timed('serialize', category=category, kind='graph'):
+            figures['graph'] = figure_entry(fig)
+
+    if 'bar' in kinds or 'pie' in kinds:
+        # Most logged first; ties by name whatever the row order, same as the clientside charts
+        df_counts = df_cat['Exercise'].value_counts(sort=False).sort_index().sort_values(ascending=False, kind='stable').reset_index()
+        df_counts.columns = ['Exercise', 'Count']
+        for kind, make_chart, title in [
+            ('bar', make_bar_chart, f'{category} Exercise Bar Chart - {selected_year}'),
+            ('pie', make_pie_chart, f'{category} Exercise Distribution - {selected_year}'),
+        ]:
+            if kind in kinds:
+                with timed('figure_build', category=category, kind=kind):
+                    fig = make_chart(df_counts, title)
+                with timed('serialize', category=category, kind=kind):
+                    figures[kind] = figure_entry(fig)
+
+    return figures
+
+if __name__ == '__main__':
+    write_layouts()
+    print(f'Wrote {LAYOUTS_PATH}')
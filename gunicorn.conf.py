@@ -0,0 +1,58 @@
+# =============================== Gunicorn Config ============================= #
+
+# gunicorn -c gunicorn.conf.py jason_fitness_tracker:server  (see Procfile)
+#
+# With PRELOAD_APP=1 (the default) the app is imported once in the gunicorn
+# master: pandas, Plotly and Dash are imported, the sheet is fetched and
+# cleaned, and PREWARM_YEARS are rendered into the figure cache before any
+# worker exists. Workers are then forked with all of it in memory, so a new
+# or restarted worker boots in milliseconds and shares the master's pages
+# copy-on-write instead of loading its own copy. Bind address, worker count
+# and threads still come from the command line, PORT and WEB_CONCURRENCY.
+#
+# The year data stays shared while refreshes find the sheet unchanged; once it
+# changes, each worker rebuilds it on its own. Set SHARED_DATA_BACKEND=arrow to
+# keep changed data shared between workers too (see shared_data.py).
+
+import gc
+import os
+import time
+
+preload_app = os.getenv('PRELOAD_APP', '1').lower() in ('1', 'true', 'yes')
+
+def on_starting(server):
+    # Counts start from zero with the server, as with prometheus_client's
+    # multiprocess mode; the last run's snapshots and exited totals go
+    import metrics
+    metrics.clear()
+
+def when_ready(server):
+    """Warm the preloaded app in the master, then freeze what it allocated"""
+    if not server.cfg.preload_app:
+        return
+
+    # Already imported by the preload (benchmarks/offline_app imports it too)
+    import jason_fitness_tracker
+
+    started = time.monotonic()
+    jason_fitness_tracker.prewarm()
+    server.log.info('Prewarmed %s in %.0f ms', ', '.join(jason_fitness_tracker.PREWARM_YEARS), (time.monotonic() - started) * 1000)
+
+    # Counted once here; workers start their own counts from zero
+    jason_fitness_tracker.metrics.flush(collectors=False)
+
+    # The collector never scans frozen objects, so workers don't write to (and
+    # copy) every page holding one just by collecting
+    gc.freeze()
+
+def pre_fork(server, worker):
+    worker.fork_started = time.monotonic()
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        import jason_fitness_tracker
+        jason_fitness_tracker.after_fork()
+
+def post_worker_init(worker):
+    # CLOCK_MONOTONIC is system-wide, so the master's start time compares directly
+    worker.log.info('Worker %s booted in %.0f ms', worker.pid, (time.monotonic() - worker.fork_started) * 1000)
@@ -2,22 +2,32 @@
 
 import numpy as np 
 import pandas as pd 
-import plotly.express as px
-import plotly.graph_objects as go
-import seaborn as sns 
 from datetime import datetime
 import os
 import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 # -------------------------------
-import requests
 import json
 import base64
-import gspread
-from google.oauth2.service_account import Credentials
 # --------------------------------
+import flask
 import dash
-from dash import dcc, html, Input, Output, State, dash_table
+from dash import dcc, html, Input, Output, State, Patch, ClientsideFunction, dash_table, no_update
 from dash.development.base_component import Component
+from dash.exceptions import PreventUpdate
+# --------------------------------
+from figures import make_line_chart, make_bar_chart, make_pie_chart, build_category_figures, figure_entry, LINE_MAX_POINTS
+from figure_cache import create_figure_cache
+from timing import timed, percentiles, reset as reset_timings
+import metrics
+import payloads
+import profiling
+from serialization import loads_split, preencoded
+from table_query import TableIndex, table_page, COLUMN_TYPES, TABLE_PAGE_SIZE
+from exports import EXPORT_FORMATS, export_chunks
+from shared_data import create_shared_data
 
 # 'data/~$bmhc_data_2024_cleaned.xlsx'
 # print('System Version:', sys.version)
@@ -33,39 +43,72 @@ report_month = datetime(2026, 1, 1).strftime("%B")
 report_year = datetime(2026, 1, 1).strftime("%Y")
 name = "Jason"
 
+# Exercise categories, in the order their sections appear on the page
+CATEGORIES = ['Push', 'Pull', 'Leg', 'Bicep', 'Tricep', 'Shoulder', 'Ab', 'Calisthenics', 'Forearm', 'Cardio']
+
+# Choices in the year dropdown
+YEARS = ['All Time', '2024', '2025', '2026']
+
 # Define the Google Sheets URL
 sheet_url = "https://docs.google.com/spreadsheets/d/1EXDabqzS1Gd1AteSqcovvUuJxrUMQvisf_MhnhFMeNk/edit?gid=0#gid=0"
 
 # Define the scope
 scope = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
 
-# Load credentials
-encoded_key = os.getenv("GOOGLE_CREDENTIALS")
-
-if encoded_key:
-    # Render: GOOGLE_CREDENTIALS is BASE64 ENCODED JSON
-    json_key = json.loads(
-        base64.b64decode(encoded_key).decode("utf-8")
-    )
-    creds = Credentials.from_service_account_info(json_key, scopes=scope)
+# Importing the app neither signs in nor fetches anything: the sheet is opened
+# by the first fetch, and gspread and google-auth are only imported then
+_client = None
+_sheet = None
+_sheet_lock = threading.Lock()
+
+def get_sheet():
+    """The fitness spreadsheet, authorized and opened on first use"""
+    global _client, _sheet
+    with _sheet_lock:
+        if _sheet is not None:
+            return _sheet
+
+        import gspread
+        from google.oauth2.service_account import Credentials
+
+        # Load credentials
+        encoded_key = os.getenv("GOOGLE_CREDENTIALS")
+
+        if encoded_key:
+            # Render: GOOGLE_CREDENTIALS is BASE64 ENCODED JSON
+            json_key = json.loads(
+                base64.b64decode(encoded_key).decode("utf-8")
+            )
+            creds = Credentials.from_service_account_info(json_key, scopes=scope)
 
-else:
-    # Local development fallback
-    creds_path = r"C:\Users\CxLos\OneDrive\Documents\Portfolio Projects\GCP\personal-projects-485203-6f6c61641541.json"
+        else:
+            # Local development fallback
+            creds_path = r"C:\Users\CxLos\OneDrive\Documents\Portfolio Projects\GCP\personal-projects-485203-6f6c61641541.json"
 
-    if not os.path.exists(creds_path):
-        raise FileNotFoundError(
-            "Service account JSON file not found and GOOGLE_CREDENTIALS is not set."
-        )
+            if not os.path.exists(creds_path):
+                raise FileNotFoundError(
+                    "Service account JSON file not found and GOOGLE_CREDENTIALS is not set."
+                )
 
-    creds = Credentials.from_service_account_file(creds_path, scopes=scope)
+            creds = Credentials.from_service_account_file(creds_path, scopes=scope)
 
-# Authorize and load the sheet
-client = gspread.authorize(creds)
-sheet = client.open_by_url(sheet_url)
+        # Authorize and load the sheet
+        _client = gspread.authorize(creds)
+        _sheet = _client.open_by_url(sheet_url)
+        return _sheet
 
 # ============================== Data Loading Function ========================== #
 
+def fetch_worksheet(title):
+    """All records of a worksheet, timed and counted as one Sheets API fetch"""
+    metrics.inc('sheets_api_calls_total', worksheet=title)
+    try:
+        with timed('fetch', worksheet=title):
+            return get_sheet().worksheet(title).get_all_records()
+    except Exception:
+        metrics.inc('sheets_api_errors_total', worksheet=title)
+        raise
+
 def load_data_for_year(year):
     """Load and process fitness data for a specific year or all years"""
     try:
@@ -76,8 +119,9 @@ def load_data_for_year(year):
             dfs = []
             for yr in all_years:
                 try:
-                    worksheet = sheet.worksheet(f"{name}_{yr}")
-                    data = pd.DataFrame(worksheet.get_all_records())
+                    records = fetch_worksheet(f"{name}_{yr}")
+                    with timed('parse', year=yr):
+                        data = pd.DataFrame(records)
                     # print(f"✅ Loaded {len(data)} rows for {yr}")
                     dfs.append(data)
                 except Exception as e:
@@ -92,8 +136,9 @@ def load_data_for_year(year):
                 print("❌ No data found for All Time")
                 return pd.DataFrame()
         else:
-            worksheet = sheet.worksheet(f"{name}_{year}")
-            data = pd.DataFrame(worksheet.get_all_records())
+            records = fetch_worksheet(f"{name}_{year}")
+            with timed('parse', year=year):
+                data = pd.DataFrame(records)
             # print(f"✅ Loaded {len(data)} rows for {year}")
             return data.copy()
             
@@ -103,9 +148,6 @@ def load_data_for_year(year):
         traceback.print_exc()
         return pd.DataFrame()
 
-# Load default year (All Time)
-df = load_data_for_year('All Time')
-
 # -------------------------------------------------
 # print(df.head())
 # print(df[["Date of Activity", "Total travel time (minutes):"]])
@@ -135,122 +177,426 @@ columns =  [
 
 # ============================== Data Preprocessing ========================== #
 
-# Get all date columns (everything except Category and Exercise)
-date_columns = [col for col in df.columns if col not in ['Category', 'Exercise']]
+@timed('reshape')
+def preprocess_data(df_year):
+    """Reshape a wide sheet (one column per date) into long Category/Exercise/Date/Weight rows"""
+    # Nothing loaded (missing worksheet or Sheets error)
+    if df_year.empty:
+        return pd.DataFrame({
+            'Category': pd.Series(dtype='object'),
+            'Exercise': pd.Series(dtype='object'),
+            'Date': pd.Series(dtype='datetime64[ns]'),
+            'Weight': pd.Series(dtype='float64'),
+        })
 
-# Reshape from wide to long format
-df_long = df.melt(
-    id_vars=['Category', 'Exercise'],  # columns to keep
-    value_vars=date_columns,  # columns to melt into rows
-    var_name='Date',        # New column name
-    value_name='Weight'     # New column name for cell values
-)
+    # Get all date columns (everything except Category and Exercise)
+    date_columns = [col for col in df_year.columns if col not in ['Category', 'Exercise']]
 
-# Remove rows where Date contains common non-date values
-# df_long = df_long[~df_long['Date'].astype(str).str.contains(r'Int\.|Unnamed|#', case=False, na=False)]
+    # Reshape from wide to long format
+    df_long = df_year.melt(
+        id_vars=['Category', 'Exercise'],  # columns to keep
+        value_vars=date_columns,  # columns to melt into rows
+        var_name='Date',        # New column name
+        value_name='Weight'     # New column name for cell values
+    )
 
-# Convert Date to datetime with format specification
-df_long['Date'] = pd.to_datetime(df_long['Date'], errors='coerce', format='mixed')
+    # Remove rows where Date contains common non-date values
+    # df_long = df_long[~df_long['Date'].astype(str).str.contains(r'Int\.|Unnamed|#', case=False, na=False)]
 
-# Remove rows with invalid dates (NaT)
-df_long = df_long.dropna(subset=['Date'])
+    # Convert Date to datetime with format specification
+    df_long['Date'] = pd.to_datetime(df_long['Date'], errors='coerce', format='mixed')
 
-# Sort by date
-df_long = df_long.sort_values('Date')
+    # Remove rows with invalid dates (NaT)
+    df_long = df_long.dropna(subset=['Date'])
 
-# Convert Weight to numeric BEFORE creating charts
-df_long['Weight'] = pd.to_numeric(df_long['Weight'], errors='coerce')
+    # Sort by date
+    df_long = df_long.sort_values('Date')
 
-# Remove rows with NaN weights
-df_long = df_long.dropna(subset=['Weight'])
-df_long = df_long[df_long['Weight'].notna()]
-df_long = df_long[df_long['Weight'] != '']  # Remove empty strings
+    # Convert Weight to numeric BEFORE creating charts
+    df_long['Weight'] = pd.to_numeric(df_long['Weight'], errors='coerce')
 
-# Strip whitespace from string columns and convert to string type explicitly
-df_long['Category'] = df_long['Category'].astype(str).str.strip()
-df_long['Exercise'] = df_long['Exercise'].astype(str).str.strip()
+    # Remove rows with NaN weights
+    df_long = df_long.dropna(subset=['Weight'])
+    df_long = df_long[df_long['Weight'].notna()]
+    df_long = df_long[df_long['Weight'] != '']  # Remove empty strings
 
-# Remove duplicate rows (same exercise on same date)
-df_long = df_long.drop_duplicates(subset=['Category', 'Exercise', 'Date'], keep='first')
+    # Strip whitespace from string columns and convert to string type explicitly
+    df_long['Category'] = df_long['Category'].astype(str).str.strip()
+    df_long['Exercise'] = df_long['Exercise'].astype(str).str.strip()
 
-# Reset index to avoid grouping issues in Plotly
-df_long = df_long.reset_index(drop=True)
+    # Remove duplicate rows (same exercise on same date)
+    df_long = df_long.drop_duplicates(subset=['Category', 'Exercise', 'Date'], keep='first')
 
-# Ensure all columns have the correct explicit types for pandas 3.0 compatibility
-df_long['Category'] = df_long['Category'].astype('object')
-df_long['Exercise'] = df_long['Exercise'].astype('object')
-df_long['Date'] = pd.to_datetime(df_long['Date'])
-df_long['Weight'] = df_long['Weight'].astype('float64')
+    # Reset index to avoid grouping issues in Plotly
+    df_long = df_long.reset_index(drop=True)
 
-# print("Melted DataFrame: \n", df_long.head(10))
+    # Ensure all columns have the correct explicit types for pandas 3.0 compatibility
+    df_long['Category'] = df_long['Category'].astype('object')
+    df_long['Exercise'] = df_long['Exercise'].astype('object')
+    df_long['Date'] = pd.to_datetime(df_long['Date'])
+    df_long['Weight'] = df_long['Weight'].astype('float64')
 
-# Helper to build line charts without relying on Plotly Express grouping
-def make_line_chart(df_cat: pd.DataFrame, title: str) -> go.Figure:
-    fig = go.Figure()
-
-    if df_cat.empty:
-        fig.update_layout(title=dict(text=title, x=0.5, xanchor='center', font=dict(size=20)))
-        return fig
-
-    for exercise_name, sub in df_cat.groupby('Exercise'):
-        # print("exercise_name:", exercise_name)
-        # print(sub.head(), "\n")
-        sub_sorted = sub.sort_values('Date')
-        fig.add_trace(
-            go.Scatter(
-                x=sub_sorted['Date'],
-                y=sub_sorted['Weight'],
-                mode='lines+markers',
-                name=str(exercise_name),
-                hovertemplate='Exercise: <b>%{fullData.name}</b><br>Date: <b>%{x|%m/%d/%Y}</b><br>Weight: <b>%{y} lbs.</b><extra></extra>',
-            )
-        )
-
-    fig.update_layout(
-        title=dict(text=title, x=0.5, xanchor='center', font=dict(size=20)),
-        xaxis=dict(tickformat='%m/%d/%Y', title='Date'),
-        yaxis=dict(title='Weight (lbs)'),
-        hovermode='closest',
-        font=dict(size=12),
-        showlegend=True,
-        legend=dict(
-            orientation="v",
-            yanchor="top",
-            y=1,
-            xanchor="left",
-            x=1.02
-        )
-    )
+    return df_long
+
+# ============================== Shared Data ========================== #
+
+# Cleaned data for a year is reused for DATA_TTL_SECONDS before the sheet is
+# fetched again, so switching between years doesn't hit the Sheets API
+DATA_TTL_SECONDS = float(os.getenv('DATA_TTL_SECONDS', '60'))
+
+# With SHARED_DATA_BACKEND set, workers on a host share one snapshot of each
+# year's cleaned data (shared_data.py), so the sheet is fetched once per host
+shared_data = create_shared_data(DATA_TTL_SECONDS)
+
+def clean_year(year):
+    """A year's cleaned table rows, ordered by (Category, Exercise, Date) as summarize_year expects"""
+    return sort_by_exercise(make_table(preprocess_data(load_data_for_year(year))))
+
+def load_clean_year(year):
+    """A year's sorted table rows and when they were fetched (time.time()), from the shared snapshot if there is one"""
+    # Snapshots are written already sorted, so each worker's line chart store
+    # and table index are the mapped frame itself plus row orders over it
+    if shared_data is None:
+        return clean_year(year), time.time()
+    return shared_data.load(year, lambda: clean_year(year))
 
-    return fig
+# print("Melted DataFrame: \n", df_long.head(10))
 
 # =========================== Initial Empty Figures =========================== #
 
-# Create empty figures for initial load
-empty_fig = go.Figure()
-empty_fig.update_layout(title=dict(text='Please Select a Year', x=0.5, font=dict(size=20)))
+# Create empty figures for initial load. Each graph is mounted with the full
+# layout of its chart kind, so callbacks only need to patch in data and titles.
+_no_data = pd.DataFrame({'Exercise': [], 'Date': [], 'Weight': [], 'Count': []})
+empty_line_fig = make_line_chart(_no_data, 'Please Select a Year')
+empty_bar_fig = make_bar_chart(_no_data, 'Please Select a Year')
+empty_pie_fig = make_pie_chart(_no_data, 'Please Select a Year')
+
+def figure_patch(entry, kind):
+    """Patch that swaps a mounted figure's traces and title for those of a figure cache entry"""
+    head, data = loads_split(entry)
+    patch = Patch()
+    patch['data'] = data
+    patch['layout']['title']['text'] = head['title']
+
+    if kind == 'graph':
+        # Drop any zoom left over from the previous year
+        patch['layout']['xaxis']['autorange'] = True
+        patch['layout']['yaxis']['autorange'] = True
+    elif kind == 'bar':
+        patch['layout']['yaxis']['categoryarray'] = head['categoryarray']
+
+    return patch
+
+def message_patch(text):
+    """Patch that clears a mounted figure and shows text as its title"""
+    patch = Patch()
+    patch['data'] = []
+    patch['layout']['title']['text'] = text
+    return patch
 
 # ========================== DataFrame Table ========================== #
 
-# create a display index column and prepare table data/columns
-df_indexed = df_long.reset_index(drop=True).copy()
+def make_table(df_long):
+    """The table's rows for the cleaned long data, numbered '#' in their original order"""
+    # create a display index column and prepare table data/columns
+    df_indexed = df_long.reset_index(drop=True)
+
+    # Reorder columns: Date first, then the rest
+    column_order = ['Date', 'Category', 'Exercise', 'Weight']
+    df_indexed = df_indexed[column_order]
+
+    # Insert '#' as the first column (1-based row numbers)
+    df_indexed.insert(0, '#', df_indexed.index + 1)
+    return df_indexed
+
+# The table is mounted empty and update_table fills it in once the page loads,
+# so importing the app doesn't wait on the sheet. Typed columns get numeric
+# and date comparisons in the filter row.
+columns = [{"name": col, "id": col, "type": column_type} for col, column_type in COLUMN_TYPES.items()]
 
-# Reorder columns: Date first, then the rest
-column_order = ['Date', 'Category', 'Exercise', 'Weight']
-df_indexed = df_indexed[column_order]
+# ============================== Data Cache ========================== #
 
-# Insert '#' as the first column (1-based row numbers)
-df_indexed.insert(0, '#', df_indexed.index + 1)
+CHART_KINDS = ('graph', 'bar', 'pie')
 
-# Convert to records for DataTable
-data = df_indexed.to_dict('records')
-columns = [{"name": col, "id": col} for col in df_indexed.columns]
+# Bar and pie charts can instead be counted and drawn in the browser from a
+# compact per-year dataset (assets/clientside_charts.js)
+CLIENTSIDE_CHARTS = os.getenv('CLIENTSIDE_CHARTS', '0').lower() in ('1', 'true', 'yes')
+SERVER_CHART_KINDS = ('graph',) if CLIENTSIDE_CHARTS else CHART_KINDS
+
+# Sheet fetches and figure builds can run as Dash background callbacks in job
+# processes (DiskcacheManager), keeping web worker threads free. Jobs hand
+# their results to the web workers through the same diskcache directory.
+BACKGROUND_CALLBACKS = os.getenv('BACKGROUND_CALLBACKS', '0').lower() in ('1', 'true', 'yes')
+BACKGROUND_CACHE_DIR = os.getenv('BACKGROUND_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.background_cache'))
+
+if BACKGROUND_CALLBACKS:
+    import diskcache
+    job_cache = diskcache.Cache(BACKGROUND_CACHE_DIR)
+else:
+    job_cache = None
+
+# Serialized figures keyed by (year, category, chart kind, data version).
+# Background jobs build figures in another process, so they need the disk backend.
+figure_cache = create_figure_cache(default_backend='disk' if BACKGROUND_CALLBACKS else 'memory')
+
+_year_data = {}
+_year_locks = {}
+_year_locks_lock = threading.Lock()
+
+def category_versions(df_long):
+    """Hash of each category's rows, used as its data version in the figure cache"""
+    if df_long.empty:
+        return {}
+    row_hashes = pd.util.hash_pandas_object(df_long[['Category', 'Exercise', 'Date', 'Weight']], index=False)
+    return {
+        category: format(int(row_hash), '016x')
+        for category, row_hash in row_hashes.groupby(df_long['Category']).sum().items()
+    }
+
+def chart_dataset(df_long):
+    """Compact columnar rows for the clientside charts: a category and exercise code per logged set"""
+    category_codes, categories = pd.factorize(df_long['Category'])
+    exercise_codes, exercises = pd.factorize(df_long['Exercise'])
+    return {
+        'categories': categories.tolist(),
+        'exercises': exercises.tolist(),
+        # Code arrays rather than lists, so they stay two buffers instead of
+        # an int object per row (JSON encodes them the same)
+        'category': category_codes,
+        'exercise': exercise_codes,
+    }
+
+def sort_by_exercise(df_table):
+    """Table rows ordered by (Category, Exercise, Date)"""
+    return df_table.sort_values(['Category', 'Exercise', 'Date'], kind='stable').reset_index(drop=True)
+
+def category_ranges(df_sorted):
+    """Each category's [start, end) row range in rows ordered by sort_by_exercise"""
+    categories = df_sorted['Category'].to_numpy()
+    starts = np.flatnonzero(np.concatenate(([True], categories[1:] != categories[:-1]))) if len(categories) else np.array([], dtype=int)
+    ends = np.append(starts[1:], len(categories))
+    return {categories[start]: (int(start), int(end)) for start, end in zip(starts, ends)}
+
+def load_time(fetched_at=None):
+    """loaded_at for data fetched at fetched_at (a time.time()), or just now"""
+    # Data another worker fetched earlier goes stale when its snapshot does
+    return time.monotonic() - (time.time() - fetched_at if fetched_at is not None else 0.0)
+
+@timed('aggregate')
+def summarize_year(df_sorted, fetched_at=None, versions=None):
+    """Everything the dashboard callbacks need from a year's sorted table rows (clean_year) apart from the figures"""
+    # Line graphs with an exercise over the per-trace point cap get downsampled
+    exercise_sizes = df_sorted.groupby(['Category', 'Exercise']).size()
+    downsampled_categories = exercise_sizes[exercise_sizes > LINE_MAX_POINTS].index.get_level_values('Category') if LINE_MAX_POINTS else []
+
+    return {
+        'loaded_at': load_time(fetched_at),
+        # Line graphs read each category as one slice of the sorted rows, with
+        # every exercise a contiguous, date-ordered run inside it
+        'df_sorted': df_sorted,
+        'category_rows': category_ranges(df_sorted),
+        'versions': versions if versions is not None else category_versions(df_sorted),
+        # Calculate total unique gym days (unique dates)
+        'total': df_sorted['Date'].nunique(),
+        'days': df_sorted.groupby('Category')['Date'].nunique().to_dict(),
+        # Indexed once per load, since every page, sort and filter change
+        # queries it. The index keeps row orders over the same sorted rows, so
+        # the table shares their columns instead of copying them.
+        'table_index': TableIndex(df_sorted),
+        'table_columns': columns,
+        'downsampled': set(downsampled_categories),
+        'chart_dataset': chart_dataset(df_sorted) if CLIENTSIDE_CHARTS else None,
+    }
+
+def category_slice(year_data, category):
+    """A category's rows from the sorted store, ordered by (Exercise, Date), without copying"""
+    start, end = year_data['category_rows'].get(category, (0, 0))
+    return year_data['df_sorted'].iloc[start:end]
+
+def is_fresh(year_data):
+    return year_data is not None and time.monotonic() - year_data['loaded_at'] < DATA_TTL_SECONDS
+
+def cached_year_data(year):
+    """A year's data if this process or a background job loaded it within DATA_TTL_SECONDS, else None"""
+    year_data = _year_data.get(year)
+    if is_fresh(year_data):
+        return year_data
+
+    # loaded_at is a system-wide monotonic clock, so job timestamps compare directly
+    if job_cache is not None:
+        year_data = job_cache.get(('year-data', year))
+        if is_fresh(year_data):
+            _year_data[year] = year_data
+            figure_cache.update_versions(year, year_data['versions'])
+            return year_data
+
+    return None
+
+def remember_year_data(year, year_data):
+    """Keep a freshly loaded year for this process and, with background callbacks, every other one"""
+    _year_data[year] = year_data
+    figure_cache.update_versions(year, year_data['versions'])
+    if job_cache is not None:
+        job_cache.set(('year-data', year), year_data, expire=DATA_TTL_SECONDS)
+
+def refresh_year_data(year, df_sorted, fetched_at=None):
+    """Year data for freshly fetched rows, keeping the previous load's if no category changed"""
+    versions = category_versions(df_sorted)
+    previous = _year_data.get(year)
+
+    # Reusing the unchanged store, index and summaries skips the rebuild and,
+    # in a preloaded worker, keeps serving the pages shared with the master.
+    # The versions don't cover row order, so the table's '#' must match too.
+    if (
+        previous is not None and versions and versions == previous['versions']
+        and np.array_equal(df_sorted['#'].to_numpy(), previous['df_sorted']['#'].to_numpy())
+    ):
+        return dict(previous, loaded_at=load_time(fetched_at))
+
+    return summarize_year(df_sorted, fetched_at, versions)
+
+def get_year_data(year):
+    """Cleaned data and summaries for a year, fetched from the sheet at most once per DATA_TTL_SECONDS"""
+    with _year_locks_lock:
+        lock = _year_locks.setdefault(year, threading.Lock())
+
+    # Concurrent requests for the same year wait for a single fetch
+    with lock:
+        year_data = cached_year_data(year)
+        if year_data is not None:
+            metrics.inc('year_data_requests_total', result='hit')
+            return year_data
+
+        metrics.inc('year_data_requests_total', result='miss')
+        year_data = refresh_year_data(year, *load_clean_year(year))
+
+        # Don't hold on to a failed or empty fetch
+        if not year_data['df_sorted'].empty:
+            remember_year_data(year, year_data)
+
+    return year_data
+
+# ============================== Figure Rendering ========================== #
+
+# Rendering every category of a year (prewarm, background loads) can fan the
+# categories out to a pool of FIGURE_WORKERS threads or processes. The default
+# of 1 builds them in turn: on one CPU, 40,000 rows took 24 ms serially, the
+# same on 2-4 threads and 39 ms on 2 processes (benchmarks/bench_parallel_render.py),
+# so a pool only helps with spare cores and years large enough to outweigh
+# shipping each category's rows to it.
+FIGURE_WORKERS = int(os.getenv('FIGURE_WORKERS', '1'))
+FIGURE_POOL = os.getenv('FIGURE_POOL', 'thread').lower()
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+def get_render_pool():
+    """Shared thread or process pool for figure builds, created on first use"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            if FIGURE_POOL == 'process':
+                _render_pool = ProcessPoolExecutor(max_workers=FIGURE_WORKERS)
+            elif FIGURE_POOL == 'thread':
+                _render_pool = ThreadPoolExecutor(max_workers=FIGURE_WORKERS, thread_name_prefix='figures')
+            else:
+                raise ValueError(f"Unknown FIGURE_POOL: {FIGURE_POOL!r} (expected 'thread' or 'process')")
+        return _render_pool
+
+def cached_category_figures(year_data, categories, selected_year):
+    """Serialized line, bar and pie figures for each category, building only what isn't cached"""
+    keys, figures, tasks = {}, {}, []
+    for category in categories:
+        version = year_data['versions'].get(category, 'empty')
+        keys[category] = {kind: (selected_year, category, kind, version) for kind in SERVER_CHART_KINDS}
+        figures[category] = {kind: figure_cache.get(key) for kind, key in keys[category].items()}
+
+        missing = tuple(kind for kind, fig_json in figures[category].items() if fig_json is None)
+        if missing:
+            tasks.append((category_slice(year_data, category), category, selected_year, missing, True))
+
+    # A single category (one section's callback) is always built inline: Dash
+    # already requests the sections concurrently
+    if FIGURE_WORKERS <= 1 or len(tasks) <= 1:
+        built = (build_category_figures(*task) for task in tasks)
+    else:
+        built = get_render_pool().map(build_category_figures, *zip(*tasks))
+
+    for (_, category, *_), category_built in zip(tasks, built):
+        for kind, fig_json in category_built.items():
+            figure_cache.put(keys[category][kind], fig_json)
+            figures[category][kind] = fig_json
+
+    return figures
+
+def cached_figures(year_data, category, selected_year):
+    """Serialized line, bar and pie figures for a category, building only what isn't cached"""
+    return cached_category_figures(year_data, [category], selected_year)[category]
+
+def category_figures(year_data, category, selected_year):
+    """Patches for a category's line, bar and pie figures"""
+    figures = cached_figures(year_data, category, selected_year)
+
+    # Graphs are already mounted, so only their traces and titles are sent,
+    # with the traces copied into the response as they were cached
+    return [figure_patch(figures[kind], kind) for kind in SERVER_CHART_KINDS]
 
 # ============================== Dash Application ========================== #
 
-app = dash.Dash(__name__)
+if BACKGROUND_CALLBACKS:
+    # Identical year loads within a DATA_TTL_SECONDS window reuse the job's result
+    background_callback_manager = dash.DiskcacheManager(
+        job_cache,
+        cache_by=[lambda: int(time.time() // DATA_TTL_SECONDS)],
+        expire=DATA_TTL_SECONDS,
+    )
+else:
+    background_callback_manager = None
+
+app = dash.Dash(__name__, background_callback_manager=background_callback_manager)
 server= app.server
 
+def callback_label(default='unknown'):
+    """First output id of the Dash callback being requested, for metrics and logs"""
+    body = flask.request.get_json(silent=True) or {}
+    return str(body.get('output', default)).strip('.').split('...')[0]
+
+# ============================== Compression ========================== #
+
+# Callback JSON, the layout and static assets are sent brotli or gzip encoded
+# (whichever the browser prefers) once they pass COMPRESS_MIN_SIZE bytes.
+COMPRESS_RESPONSES = os.getenv('COMPRESS_RESPONSES', '1').lower() in ('1', 'true', 'yes')
+
+# Registered before the compressor so it runs after it and sees the wire size
+@server.after_request
+def record_transfer_bytes(response):
+    if payloads.PAYLOAD_METRICS and flask.request.path.endswith('/_dash-update-component') and response.content_length:
+        payloads.record_transfer(callback_label(), response.content_length, response.headers.get('Content-Encoding', 'identity'))
+    return response
+
+if COMPRESS_RESPONSES:
+    server.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_LEVEL=int(os.getenv('COMPRESS_LEVEL', '6')),
+        COMPRESS_BR_LEVEL=int(os.getenv('COMPRESS_BR_LEVEL', '4')),
+        COMPRESS_MIN_SIZE=int(os.getenv('COMPRESS_MIN_SIZE', '500')),
+        # Registered below, so downloads can be left out
+        COMPRESS_REGISTER=False,
+    )
+    try:
+        from flask_compress import Compress
+        compress = Compress(server)
+
+        @server.after_request
+        def compress_response(response):
+            # Compressing a streamed export would buffer the whole download
+            # before sending any of it
+            if flask.request.path.startswith('/export/'):
+                return response
+            return compress.after_request(response)
+    except ImportError:
+        print('flask-compress is not installed, so responses are sent uncompressed')
+
 app.layout = html.Div(
     children=[ 
         html.Div(
@@ -269,12 +615,7 @@ app.layout = html.Div(
                         html.Label('', style={'marginRight': '10px', 'fontWeight': 'bold'}),
                         dcc.Dropdown(
                             id='year-dropdown',
-                            options=[
-                                {'label': 'All Time', 'value': 'All Time'},
-                                {'label': '2024', 'value': '2024'},
-                                {'label': '2025', 'value': '2025'},
-                                {'label': '2026', 'value': '2026'},
-                            ],
+                            options=[{'label': year, 'value': year} for year in YEARS],
                             # value='All Time',
                             value=None,
                             placeholder='Select Year',  # Add this line
@@ -290,6 +631,17 @@ app.layout = html.Div(
                     ],
                     style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'margin': '20px 0'}
                 ),
+                # Progress of the background year load
+                *([
+                    html.Div(
+                        id='load-status-box',
+                        children=[
+                            html.Span(id='load-status', style={'marginRight': '10px'}),
+                            html.Progress(id='load-progress', value='0', max='3'),
+                        ],
+                        style={'display': 'none'}
+                    ),
+                ] if BACKGROUND_CALLBACKS else []),
                 html.Div(
                     className='btn-box', 
                     children=[
@@ -385,6 +737,7 @@ html.Div(
         # ),
         
         html.Div(
+            id='push-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -423,7 +776,7 @@ html.Div(
                         dcc.Graph(
                             id='push-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -436,7 +789,7 @@ html.Div(
                                 dcc.Graph(
                                     id='push-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -446,7 +799,7 @@ html.Div(
                                 dcc.Graph(
                                     id='push-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -456,6 +809,7 @@ html.Div(
         ),
         
         html.Div(
+            id='pull-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -495,7 +849,7 @@ html.Div(
                         dcc.Graph(
                             id='pull-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -508,7 +862,7 @@ html.Div(
                                 dcc.Graph(
                                     id='pull-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -518,7 +872,7 @@ html.Div(
                                 dcc.Graph(
                                     id='pull-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -528,6 +882,7 @@ html.Div(
         ),
         
         html.Div(
+            id='leg-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -566,7 +921,7 @@ html.Div(
                         dcc.Graph(
                             id='leg-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -579,7 +934,7 @@ html.Div(
                                 dcc.Graph(
                                     id='leg-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -589,7 +944,7 @@ html.Div(
                                 dcc.Graph(
                                     id='leg-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -599,6 +954,7 @@ html.Div(
         ),
         
         html.Div(
+            id='bicep-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -637,7 +993,7 @@ html.Div(
                         dcc.Graph(
                             id='bicep-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -650,7 +1006,7 @@ html.Div(
                                 dcc.Graph(
                                     id='bicep-bar',
                                     className='graph',
-                                    figure=empty_fig    
+                                    figure=empty_bar_fig    
                                 )
                             ]
                         ),
@@ -660,7 +1016,7 @@ html.Div(
                                 dcc.Graph(
                                     id='bicep-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -670,6 +1026,7 @@ html.Div(
         ),
         
         html.Div(
+            id='tricep-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -708,7 +1065,7 @@ html.Div(
                         dcc.Graph(
                             id='tricep-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -721,7 +1078,7 @@ html.Div(
                                 dcc.Graph(
                                     id='tricep-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -731,7 +1088,7 @@ html.Div(
                                 dcc.Graph(
                                     id='tricep-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -741,6 +1098,7 @@ html.Div(
         ),
         
         html.Div(
+            id='shoulder-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -779,7 +1137,7 @@ html.Div(
                         dcc.Graph(
                             id='shoulder-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -792,7 +1150,7 @@ html.Div(
                                 dcc.Graph(
                                     id='shoulder-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -802,7 +1160,7 @@ html.Div(
                                 dcc.Graph(
                                     id='shoulder-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -813,6 +1171,7 @@ html.Div(
 
         
         html.Div(
+            id='calisthenics-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -851,7 +1210,7 @@ html.Div(
                         dcc.Graph(
                             id='calisthenics-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -864,7 +1223,7 @@ html.Div(
                                 dcc.Graph(
                                     id='calisthenics-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -874,7 +1233,7 @@ html.Div(
                                 dcc.Graph(
                                     id='calisthenics-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -885,6 +1244,7 @@ html.Div(
 
                 
         html.Div(
+            id='ab-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -923,7 +1283,7 @@ html.Div(
                         dcc.Graph(
                             id='ab-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -936,7 +1296,7 @@ html.Div(
                                 dcc.Graph(
                                     id='ab-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -946,7 +1306,7 @@ html.Div(
                                 dcc.Graph(
                                     id='ab-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -956,6 +1316,7 @@ html.Div(
         ),
         
         html.Div(
+            id='forearm-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -994,7 +1355,7 @@ html.Div(
                         dcc.Graph(
                             id='forearm-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -1007,7 +1368,7 @@ html.Div(
                                 dcc.Graph(
                                     id='forearm-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -1017,7 +1378,7 @@ html.Div(
                                 dcc.Graph(
                                     id='forearm-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -1027,6 +1388,7 @@ html.Div(
         ),
         
         html.Div(
+            id='cardio-section',
             className='graph-row',
             children=[
                 html.Div(
@@ -1065,7 +1427,7 @@ html.Div(
                         dcc.Graph(
                             id='cardio-graph',
                             className='wide-graph',
-                            figure=empty_fig
+                            figure=empty_line_fig
                         )
                     ]
                 ),
@@ -1078,7 +1440,7 @@ html.Div(
                                 dcc.Graph(
                                     id='cardio-bar',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_bar_fig
                                 )
                             ]
                         ),
@@ -1088,7 +1450,7 @@ html.Div(
                                 dcc.Graph(
                                     id='cardio-pie',
                                     className='graph',
-                                    figure=empty_fig
+                                    figure=empty_pie_fig
                                 )
                             ]
                         ),
@@ -1109,14 +1471,29 @@ html.Div(
                 className='data-title',
                 children=f'Fitness Tracker Table {report_year}'
             ),
+
+            # Downloads of the table as filtered and sorted (hrefs kept current by assets/table_export.js)
+            html.Div(
+                className='export-links',
+                children=[
+                    html.A('Download CSV', id='export-csv', href='/export/All%20Time.csv', download=''),
+                    html.A('Download Parquet', id='export-parquet', href='/export/All%20Time.parquet', download=''),
+                ]
+            ),
             
             dash_table.DataTable(
                 id='applications-table',
-                data=data, # type: ignore
+                data=[],
                 columns=columns, # type: ignore
-                page_size=20,
-                sort_action='native',
-                filter_action='native',
+                # Paged, sorted and filtered on the server (table_query.py)
+                page_action='custom',
+                page_current=0,
+                page_size=TABLE_PAGE_SIZE,
+                page_count=1,
+                sort_action='custom',
+                sort_by=[],
+                filter_action='custom',
+                filter_query='',
                 row_selectable='multi',
                 style_table={
                     'overflowX': 'auto',
@@ -1155,989 +1532,463 @@ html.Div(
             ),
         ]
     ),
+
+    # Year whose data the background load job has ready
+    *([dcc.Store(id='loaded-year')] if BACKGROUND_CALLBACKS else []),
+
+    # Whether each category's line graph was downsampled, refined on zoom
+    *[dcc.Store(id=f'{category.lower()}-downsampled', data=False) for category in CATEGORIES],
+
+    # Category sections are only rendered once they scroll into view
+    # (assets/lazy_sections.js clicks the trigger when visibility changes)
+    html.Button(id='visible-sections-trigger', n_clicks=0, style={'display': 'none'}),
+    dcc.Store(id='section-config', data={'categories': CATEGORIES}),
+    *[dcc.Store(id=f'{category.lower()}-visible', data=False) for category in CATEGORIES],
+    *[dcc.Store(id=f'{category.lower()}-rendered') for category in CATEGORIES],
+
+    # Per-year datasets for the clientside bar and pie charts
+    *([
+        dcc.Store(id='chart-config', data={'categories': CATEGORIES, 'ttl_ms': DATA_TTL_SECONDS * 1000}),
+        dcc.Store(id='chart-data-request'),
+        dcc.Store(id='chart-data-response'),
+        dcc.Store(id='chart-data-cache', storage_type='local'),
+    ] if CLIENTSIDE_CHARTS else []),
 ])
 
-# ============================== Callback ========================== #
+# ============================== Callbacks ========================== #
+
+# The header, each category section and the table are separate callbacks, so
+# Dash sends them as concurrent requests and sections paint as they finish.
+# They share one sheet fetch through get_year_data. Category sections are also
+# lazy: one only renders while it's on screen, and only once per year.
+
+# With background callbacks, the sections wait for the load job rather than
+# the dropdown itself
+YEAR_INPUT = Input('loaded-year', 'data') if BACKGROUND_CALLBACKS else Input('year-dropdown', 'value')
+
+if BACKGROUND_CALLBACKS:
+    # Picking another year while a load is running cancels the old job
+    @app.callback(
+        Output('loaded-year', 'data'),
+        Input('year-dropdown', 'value'),
+        background=True,
+        running=[(Output('load-status-box', 'style'), {'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center'}, {'display': 'none'})],
+        progress=[Output('load-status', 'children'), Output('load-progress', 'value')],
+        prevent_initial_call=True
+    )
+    def load_year_job(set_progress, selected_year):
+        selected_year = selected_year or 'All Time'
+
+        try:
+            year_data = cached_year_data(selected_year)
+            if year_data is None:
+                set_progress((f'Fetching {selected_year}…', '0'))
+                df_sorted, fetched_at = load_clean_year(selected_year)
+
+                set_progress((f'Processing {selected_year}…', '1'))
+                year_data = refresh_year_data(selected_year, df_sorted, fetched_at)
+                if not year_data['df_sorted'].empty:
+                    remember_year_data(selected_year, year_data)
+
+            # Figures land in the shared figure cache for the section callbacks
+            set_progress((f'Rendering {selected_year}…', '2'))
+            cached_category_figures(year_data, CATEGORIES, selected_year)
+
+        except Exception as e:
+            # The section callbacks retry the load and show its error
+            print(f"❌ ERROR in background load for {selected_year}: {str(e)}")
+
+        return selected_year
+
+def load_year(selected_year, section):
+    """Cached data for a callback, or None (after logging) if the fetch failed"""
+    try:
+        print(f"🔄 {section} callback triggered for year: {selected_year}")
+
+        # Load data for selected year (cached for DATA_TTL_SECONDS)
+        return get_year_data(selected_year)
+
+    except Exception as e:
+        print(f"❌ ERROR in {section} callback: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return None
 
 @app.callback(
     [
         Output('year-subtitle', 'children'),
         Output('total-exercises-title', 'children'),
         Output('total-exercises', 'children'),
-        Output('push-days-title', 'children'),
-        Output('push-days', 'children'),
-        Output('pull-days-title', 'children'),
-        Output('pull-days', 'children'),
-        Output('leg-days-title', 'children'),
-        Output('leg-days', 'children'),
-        Output('bicep-days-title', 'children'),
-        Output('bicep-days', 'children'),
-        Output('tricep-days-title', 'children'),
-        Output('tricep-days', 'children'),
-        Output('shoulder-days-title', 'children'),
-        Output('shoulder-days', 'children'),
-        Output('calisthenics-days-title', 'children'),
-        Output('calisthenics-days', 'children'),
-        Output('ab-days-title', 'children'),
-        Output('ab-days', 'children'),
-        Output('forearm-days-title', 'children'),
-        Output('forearm-days', 'children'),
-        Output('cardio-days-title', 'children'),
-        Output('cardio-days', 'children'),
-        Output('push-graph', 'figure'),
-        Output('push-bar', 'figure'),
-        Output('push-pie', 'figure'),
-        Output('pull-graph', 'figure'),
-        Output('pull-bar', 'figure'),
-        Output('pull-pie', 'figure'),
-        Output('leg-graph', 'figure'),
-        Output('leg-bar', 'figure'),
-        Output('leg-pie', 'figure'),
-        Output('bicep-graph', 'figure'),
-        Output('bicep-bar', 'figure'),
-        Output('bicep-pie', 'figure'),
-        Output('tricep-graph', 'figure'),
-        Output('tricep-bar', 'figure'),
-        Output('tricep-pie', 'figure'),
-        Output('shoulder-graph', 'figure'),
-        Output('shoulder-bar', 'figure'),
-        Output('shoulder-pie', 'figure'),
-        Output('ab-graph', 'figure'),
-        Output('ab-bar', 'figure'),
-        Output('ab-pie', 'figure'),
-        Output('calisthenics-graph', 'figure'),
-        Output('calisthenics-bar', 'figure'),
-        Output('calisthenics-pie', 'figure'),
-        Output('forearm-graph', 'figure'),
-        Output('forearm-bar', 'figure'),
-        Output('forearm-pie', 'figure'),
-        Output('cardio-graph', 'figure'),
-        Output('cardio-bar', 'figure'),
-        Output('cardio-pie', 'figure'),
-        Output('table-title', 'children'),
-        Output('applications-table', 'data'),
-        Output('applications-table', 'columns'),
     ],
-    [Input('year-dropdown', 'value')],
+    [YEAR_INPUT],
     prevent_initial_call=True
-    # prevent_initial_call=False 
 )
-def update_dashboard(selected_year):
+def update_header(selected_year):
 
     # Handle None (no selection yet) - this is the key fix
     if selected_year is None:
         selected_year = 'All Time'
 
-    try:
-        print(f"🔄 Callback triggered for year: {selected_year}")
-        
-        # Load data for selected year
-        df_year = load_data_for_year(selected_year)
-        # print(f"✅ Loaded {len(df_year)} rows for {selected_year}")
-        
-        # ...existing code...
-        
-    except Exception as e:
-        print(f"❌ ERROR in callback: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        
-        # Return empty/error state
-        return (
-            f"Error: {selected_year}",
-            "Error loading data",
-            0,
-            *["Error"] * 20,  # All other text outputs
-            *[empty_fig] * 30,  # All graph outputs
-            "Error loading table",
-            [],
-            []
-        )
-
-    # Load data for selected year
-    df_year = load_data_for_year(selected_year)
-    
-    # Get all date columns (everything except Category and Exercise)
-    date_columns = [col for col in df_year.columns if col not in ['Category', 'Exercise']]
-    
-    # Reshape from wide to long format
-    df_long = df_year.melt(
-        id_vars=['Category', 'Exercise'],
-        value_vars=date_columns,
-        var_name='Date',
-        value_name='Weight'
-    )
-    
-    # Convert Date to datetime with format specification
-    df_long['Date'] = pd.to_datetime(df_long['Date'], errors='coerce', format='mixed')
-    df_long = df_long.sort_values('Date')
-    
-    # Convert Weight to numeric
-    df_long['Weight'] = pd.to_numeric(df_long['Weight'], errors='coerce')
-    
-    # Remove rows with NaN weights
-    df_long = df_long.dropna(subset=['Weight'])
-    df_long = df_long[df_long['Weight'].notna()]
-    df_long = df_long[df_long['Weight'] != '']
-    
-    # Strip whitespace
-    df_long['Category'] = df_long['Category'].astype(str).str.strip()
-    df_long['Exercise'] = df_long['Exercise'].astype(str).str.strip()
-    
-    # Remove duplicates
-    df_long = df_long.drop_duplicates(subset=['Category', 'Exercise', 'Date'], keep='first')
-    df_long = df_long.reset_index(drop=True)
-    
-    # Ensure correct types
-    df_long['Category'] = df_long['Category'].astype('object')
-    df_long['Exercise'] = df_long['Exercise'].astype('object')
-    df_long['Date'] = pd.to_datetime(df_long['Date'])
-    df_long['Weight'] = df_long['Weight'].astype('float64')
-    
-    # Calculate total unique gym days (unique dates)
-    total = df_long['Date'].nunique()
-    
-    # Create graphs for each category
-    df_push = df_long[df_long['Category'] == 'Push'].reset_index(drop=True)
-    push_days = df_push['Date'].nunique() if not df_push.empty else 0
-    push_fig = make_line_chart(df_push, f'Push Progress Over Time - {selected_year}')
-
-    df_push_counts = df_push['Exercise'].value_counts().reset_index()
-    df_push_counts.columns = ['Exercise', 'Count']
-
-    push_bar_fig = px.bar(
-        df_push_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h',
-        # color_discrete_sequence=px.colors.qualitative.Vivid
-    ).update_layout(
-        title=dict(
-            text=f'Push Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(size=21, 
-            family='Calibri', 
-            color='black')
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
-    )
+    with timed('callback', section='Header', year=selected_year):
+        year_data = load_year(selected_year, 'Header')
+    if year_data is None:
+        return f"Error: {selected_year}", "Error loading data", 0
 
-    push_pie_fig = px.pie(
-        df_push_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Push Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>Exercise:</b> %{y}<br><b>Count</b>: %{x}<extra></extra>' 
-    )
-    
-    df_pull = df_long[df_long['Category'] == 'Pull'].reset_index(drop=True)
-    pull_days = df_pull['Date'].nunique() if not df_pull.empty else 0
-    pull_fig = make_line_chart(df_pull, f'Pull Progress Over Time - {selected_year}')
-
-    df_pull_counts = df_pull['Exercise'].value_counts().reset_index()
-    df_pull_counts.columns = ['Exercise', 'Count']
-
-    pull_bar_fig = px.bar(
-        df_pull_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Pull Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
-    )
+    return selected_year, f'Total Gym Days - {selected_year}', year_data['total']
 
-    pull_pie_fig = px.pie(
-        df_pull_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Pull Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
+app.clientside_callback(
+    ClientsideFunction(namespace='sections', function_name='visible'),
+    [Output(f'{category.lower()}-visible', 'data') for category in CATEGORIES],
+    Input('visible-sections-trigger', 'n_clicks'),
+    State('section-config', 'data'),
+    [State(f'{category.lower()}-visible', 'data') for category in CATEGORIES],
+    prevent_initial_call=True
+)
+
+def register_category_callback(category):
+    """Day count and figures for one category section, built once it's on screen"""
+    prefix = category.lower()
+
+    @app.callback(
+        [
+            Output(f'{prefix}-days-title', 'children'),
+            Output(f'{prefix}-days', 'children'),
+            # Line graph, plus bar and pie charts unless they're drawn clientside
+            *[Output(f'{prefix}-{kind}', 'figure') for kind in SERVER_CHART_KINDS],
+            Output(f'{prefix}-downsampled', 'data'),
+            Output(f'{prefix}-rendered', 'data'),
+        ],
+        [
+            YEAR_INPUT,
+            Input(f'{prefix}-visible', 'data'),
+        ],
+        State(f'{prefix}-rendered', 'data'),
+        prevent_initial_call=True
     )
-    
-    df_leg = df_long[df_long['Category'] == 'Leg'].reset_index(drop=True)
-    leg_days = df_leg['Date'].nunique() if not df_leg.empty else 0
-    leg_fig = make_line_chart(df_leg, f'Leg Progress Over Time - {selected_year}')
-
-    df_leg_counts = df_leg['Exercise'].value_counts().reset_index()
-    df_leg_counts.columns = ['Exercise', 'Count']
-
-    leg_bar_fig = px.bar(
-        df_leg_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Leg Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
+    def update_category(selected_year, visible, rendered_year):
+
+        # Nothing to show before a year is picked, for sections off screen, or
+        # for a section already showing this year
+        if selected_year is None or not visible or rendered_year == selected_year:
+            raise PreventUpdate
+
+        with timed('callback', section=category, year=selected_year):
+            year_data = load_year(selected_year, category)
+            if year_data is None:
+                return "Error", "Error", *[message_patch('Error loading data')] * len(SERVER_CHART_KINDS), False, None
+
+            return (
+                f'Total {category} Days - {selected_year}',
+                year_data['days'].get(category, 0),
+                *category_figures(year_data, category, selected_year),
+                category in year_data['downsampled'],
+                selected_year,
             )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
-    )
 
-    leg_pie_fig = px.pie(
-        df_leg_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Leg Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
-    )
-    
-    # Calculate bicep days
-    df_bicep = df_long[df_long['Category'] == 'Bicep'].reset_index(drop=True)
-    bicep_days = df_bicep['Date'].nunique() if not df_bicep.empty else 0
-    bicep_fig = make_line_chart(df_bicep, f'Bicep Progress Over Time - {selected_year}')
+for category in CATEGORIES:
+    register_category_callback(category)
 
-    df_bicep_counts = df_bicep['Exercise'].value_counts().reset_index()
-    df_bicep_counts.columns = ['Exercise', 'Count']
-    
-    bicep_bar_fig = px.bar(
-        df_bicep_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Bicep Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
-    )
+@app.callback(
+    [
+        Output('table-title', 'children'),
+        Output('applications-table', 'data'),
+        Output('applications-table', 'columns'),
+        Output('applications-table', 'page_count'),
+        Output('applications-table', 'page_current'),
+    ],
+    [
+        YEAR_INPUT,
+        Input('applications-table', 'page_current'),
+        Input('applications-table', 'page_size'),
+        Input('applications-table', 'sort_by'),
+        Input('applications-table', 'filter_query'),
+    ],
+    # Also runs on page load, to fill the table that is mounted empty
+    prevent_initial_call=False
+)
+def update_table(selected_year, page_current, page_size, sort_by, filter_query):
+    if selected_year is None:
+        selected_year = 'All Time'
 
-    bicep_pie_fig = px.pie(
-        df_bicep_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Bicep Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
-    )
-    
-    df_tricep = df_long[df_long['Category'] == 'Tricep'].reset_index(drop=True)
-    tricep_days = df_tricep['Date'].nunique() if not df_tricep.empty else 0
-    tricep_fig = make_line_chart(df_tricep, f'Tricep Progress Over Time - {selected_year}')
-
-    df_tricep_counts = df_tricep['Exercise'].value_counts().reset_index()
-    df_tricep_counts.columns = ['Exercise', 'Count']
-
-    tricep_bar_fig = px.bar(
-        df_tricep_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Tricep Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
-    )
+    # A new year starts back on the first page
+    if dash.ctx.triggered_id == YEAR_INPUT.component_id:
+        page_current = 0
 
-    tricep_pie_fig = px.pie(
-        df_tricep_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Tricep Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
-    )
-    
-    df_shoulder = df_long[df_long['Category'] == 'Shoulder'].reset_index(drop=True)
-    shoulder_days = df_shoulder['Date'].nunique() if not df_shoulder.empty else 0
-    shoulder_fig = make_line_chart(df_shoulder, f'Shoulder Progress Over Time - {selected_year}')
-
-    df_shoulder_counts = df_shoulder['Exercise'].value_counts().reset_index()
-    df_shoulder_counts.columns = ['Exercise', 'Count']
-
-    shoulder_bar_fig = px.bar(
-        df_shoulder_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Shoulder Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
-    )
+    with timed('callback', section='Table', year=selected_year):
+        year_data = load_year(selected_year, 'Table')
+        if year_data is None:
+            return "Error loading table", [], [], 1, 0
 
-    shoulder_pie_fig = px.pie(
-        df_shoulder_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Shoulder Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
-    )
-    
-    df_ab = df_long[df_long['Category'] == 'Ab'].reset_index(drop=True)
-    ab_days = df_ab['Date'].nunique() if not df_ab.empty else 0
-    ab_fig = make_line_chart(df_ab, f'Ab Progress Over Time - {selected_year}')
-
-    df_ab_counts = df_ab['Exercise'].value_counts().reset_index()
-    df_ab_counts.columns = ['Exercise', 'Count']
-
-    ab_bar_fig = px.bar(
-        df_ab_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Ab Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
-    )
+        with timed('table_query', year=selected_year):
+            records, page_count, page_current = table_page(year_data['table_index'], page_current, page_size, sort_by, filter_query)
 
-    ab_pie_fig = px.pie(
-        df_ab_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Ab Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
-    )
-    
-    df_calisthenics = df_long[df_long['Category'] == 'Calisthenics'].reset_index(drop=True)
-    calisthenics_days = df_calisthenics['Date'].nunique() if not df_calisthenics.empty else 0
-    calisthenics_fig = make_line_chart(df_calisthenics, f'Calisthenics Progress Over Time - {selected_year}')
-
-    df_calisthenics_counts = df_calisthenics['Exercise'].value_counts().reset_index()
-    df_calisthenics_counts.columns = ['Exercise', 'Count']
-
-    calisthenics_bar_fig = px.bar(
-        df_calisthenics_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Calisthenics Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
+    return f'Fitness Tracker Table - {selected_year}', preencoded(records), year_data['table_columns'], page_count, page_current
+
+# ============================ Clientside Charts ========================== #
+
+if CLIENTSIDE_CHARTS:
+    app.clientside_callback(
+        ClientsideFunction(namespace='charts', function_name='request_year'),
+        Output('chart-data-request', 'data'),
+        Input('year-dropdown', 'value'),
+        State('chart-data-cache', 'data'),
+        State('chart-config', 'data'),
+        prevent_initial_call=True
     )
 
-    calisthenics_pie_fig = px.pie(
-        df_calisthenics_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Calisthenics Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
+    @app.callback(
+        Output('chart-data-response', 'data'),
+        Input('chart-data-request', 'data'),
+        prevent_initial_call=True
     )
-    
-    df_forearm = df_long[df_long['Category'] == 'Forearm'].reset_index(drop=True)
-    forearm_days = df_forearm['Date'].nunique() if not df_forearm.empty else 0
-    forearm_fig = make_line_chart(df_forearm, f'Forearm Progress Over Time - {selected_year}')
-
-    df_forearm_counts = df_forearm['Exercise'].value_counts().reset_index()
-    df_forearm_counts.columns = ['Exercise', 'Count']
-
-    forearm_bar_fig = px.bar(
-        df_forearm_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Forearm Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
+    def serve_chart_dataset(year):
+        year_data = get_year_data(year)
+        return {'year': year, 'fetched_at': time.time() * 1000, 'dataset': year_data['chart_dataset']}
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='charts', function_name='merge_dataset'),
+        Output('chart-data-cache', 'data'),
+        Input('chart-data-response', 'data'),
+        State('chart-data-cache', 'data'),
+        prevent_initial_call=True
     )
 
-    forearm_pie_fig = px.pie(
-        df_forearm_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Forearm Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
-    )
-    
-    df_cardio = df_long[df_long['Category'] == 'Cardio'].reset_index(drop=True)
-    cardio_days = df_cardio['Date'].nunique() if not df_cardio.empty else 0
-    cardio_fig = make_line_chart(df_cardio, f'Cardio Progress Over Time - {selected_year}')
-
-    df_cardio_counts = df_cardio['Exercise'].value_counts().reset_index()
-    df_cardio_counts.columns = ['Exercise', 'Count']
-
-    cardio_bar_fig = px.bar(
-        df_cardio_counts, 
-        y="Exercise", 
-        x='Count', 
-        color="Exercise", 
-        text='Count', 
-        orientation='h'
-    ).update_layout(
-        title=dict(
-            text=f'Cardio Exercise Bar Chart - {selected_year}', 
-            x=0.5, 
-            font=dict(
-                size=21, 
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        ), 
-        yaxis=dict(
-            tickfont=dict(size=16), 
-            title=dict(
-                text="Exercise", 
-                font=dict(size=16)
-            )
-        ), 
-        xaxis=dict(
-            title=dict(
-                text='Count', 
-                font=dict(size=16)
-            )
-        ), 
-        legend=dict(visible=False), 
-        hovermode='closest', 
-        bargap=0.08, 
-        bargroupgap=0
-    ).update_traces(
-        textposition='auto', 
-        hovertemplate='<b>Exercise:</b> %{label}<br><b>Count</b>: %{x}<extra></extra>'
+    app.clientside_callback(
+        ClientsideFunction(namespace='charts', function_name='render'),
+        [Output(f'{category.lower()}-{kind}', 'figure') for category in CATEGORIES for kind in ('bar', 'pie')],
+        Input('year-dropdown', 'value'),
+        Input('chart-data-cache', 'data'),
+        State('chart-config', 'data'),
+        [State(f'{category.lower()}-{kind}', 'figure') for category in CATEGORIES for kind in ('bar', 'pie')],
+        prevent_initial_call=True
     )
 
-    cardio_pie_fig = px.pie(
-        df_cardio_counts, 
-        names="Exercise", 
-        values='Count'
-    ).update_layout(
-        title=dict(
-            text=f'Cardio Exercise Distribution - {selected_year}',
-            x=0.5, 
-            font=dict(
-                size=21,
-                family='Calibri', 
-                color='black'
-            )
-        ), 
-        font=dict(
-            family='Calibri',
-            size=16, 
-            color='black'
-        )
-    ).update_traces(
-        rotation=100, 
-        texttemplate='%{percent:.1%}', 
-        hovertemplate='<b>%{label}</b>: %{value}<extra></extra>'
+# ============================== Exports ========================== #
+
+app.clientside_callback(
+    ClientsideFunction(namespace='exports', function_name='links'),
+    [Output('export-csv', 'href'), Output('export-parquet', 'href')],
+    [
+        Input('year-dropdown', 'value'),
+        Input('applications-table', 'filter_query'),
+        Input('applications-table', 'sort_by'),
+    ],
+)
+
+@server.route('/export/<year>.<fmt>')
+def export_year(year, fmt):
+    """A year's table rows as CSV or Parquet, filtered and sorted like the table (?filter_query=&sort_by=)"""
+    if year not in YEARS or fmt not in EXPORT_FORMATS:
+        flask.abort(404)
+
+    try:
+        sort_by = json.loads(flask.request.args.get('sort_by') or '[]')
+    except ValueError:
+        sort_by = []
+    sort_by = [item for item in sort_by if isinstance(item, dict)] if isinstance(sort_by, list) else []
+
+    year_data = load_year(year, 'Export')
+    if year_data is None or year_data['df_sorted'].empty:
+        flask.abort(503)
+
+    index = year_data['table_index']
+    rows = index.query(flask.request.args.get('filter_query', ''), sort_by)
+    file_name = f"{name}_fitness_tracker_{year.replace(' ', '_')}.{fmt}"
+    return flask.Response(
+        flask.stream_with_context(export_chunks(fmt, index.df, rows)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={
+            'Content-Disposition': f'attachment; filename="{file_name}"',
+        },
     )
-    
-    # Prepare table data
-    df_indexed = df_long.reset_index(drop=True).copy()
-    column_order = ['Date', 'Category', 'Exercise', 'Weight']
-    df_indexed = df_indexed[column_order]
-    df_indexed.insert(0, '#', df_indexed.index + 1)
-    
-    table_data = df_indexed.to_dict('records')
-    table_columns = [{"name": col, "id": col} for col in df_indexed.columns]
-    table_title = f'Fitness Tracker Table - {selected_year}'
-    rollup_title = f'Total Gym Days - {selected_year}'
-    push_title = f'Total Push Days - {selected_year}'
-    pull_title = f'Total Pull Days - {selected_year}'
-    leg_title = f'Total Leg Days - {selected_year}'
-    bicep_title = f'Total Bicep Days - {selected_year}'
-    tricep_title = f'Total Tricep Days - {selected_year}'
-    shoulder_title = f'Total Shoulder Days - {selected_year}'
-    calisthenics_title = f'Total Calisthenics Days - {selected_year}'
-    ab_title = f'Total Ab Days - {selected_year}'
-    forearm_title = f'Total Forearm Days - {selected_year}'
-    cardio_title = f'Total Cardio Days - {selected_year}'
-    year_subtitle = selected_year
-    
-    return (
-        year_subtitle,
-        rollup_title,
-        total,
-        push_title,
-        push_days,
-        pull_title,
-        pull_days,
-        leg_title,
-        leg_days,
-        bicep_title,
-        bicep_days,
-        tricep_title,
-        tricep_days,
-        shoulder_title,
-        shoulder_days,
-        calisthenics_title,
-        calisthenics_days,
-        ab_title,
-        ab_days,
-        forearm_title,
-        forearm_days,
-        cardio_title,
-        cardio_days,
-        push_fig,
-        push_bar_fig,
-        push_pie_fig,
-        pull_fig,
-        pull_bar_fig,
-        pull_pie_fig,
-        leg_fig,
-        leg_bar_fig,
-        leg_pie_fig,
-        bicep_fig,
-        bicep_bar_fig,
-        bicep_pie_fig,
-        tricep_fig,
-        tricep_bar_fig,
-        tricep_pie_fig,
-        shoulder_fig,
-        shoulder_bar_fig,
-        shoulder_pie_fig,
-        ab_fig,
-        ab_bar_fig,
-        ab_pie_fig,
-        calisthenics_fig,
-        calisthenics_bar_fig,
-        calisthenics_pie_fig,
-        forearm_fig,
-        forearm_bar_fig,
-        forearm_pie_fig,
-        cardio_fig,
-        cardio_bar_fig,
-        cardio_pie_fig,
-        table_title,
-        table_data,
-        table_columns
+
+# ============================ Zoom Refinement ========================== #
+
+def zoom_window(relayout_data):
+    """Date range a graph was zoomed to, 'reset' when zoomed back out, None otherwise"""
+    if not relayout_data:
+        return None
+    if relayout_data.get('xaxis.autorange'):
+        return 'reset'
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return None
+
+def zoom_bounds(window):
+    """(start, end) of a zoom window as Timestamps, None unless it is two ordered dates"""
+    # relayoutData comes from the client, so it may hold anything
+    try:
+        start, end = (pd.Timestamp(value) for value in window)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if start is pd.NaT or end is pd.NaT or start.tz is not None or end.tz is not None or start > end:
+        return None
+    return start, end
+
+def register_zoom_callback(category):
+    """Rebuild a downsampled line graph at full resolution for the zoomed date window"""
+    graph_id = f'{category.lower()}-graph'
+
+    @app.callback(
+        Output(graph_id, 'figure', allow_duplicate=True),
+        Input(graph_id, 'relayoutData'),
+        State('year-dropdown', 'value'),
+        State(f'{category.lower()}-downsampled', 'data'),
+        prevent_initial_call=True
     )
+    def refine_on_zoom(relayout_data, selected_year, downsampled):
+        window = zoom_window(relayout_data)
+
+        # Graphs that were never downsampled already hold every point
+        if window is None or not downsampled:
+            raise PreventUpdate
+
+        bounds = None
+        if window != 'reset':
+            bounds = zoom_bounds(window)
+            if bounds is None:
+                return no_update
+
+        if selected_year is None:
+            selected_year = 'All Time'
+
+        year_data = load_year(selected_year, f'{category} zoom')
+        if year_data is None:
+            return no_update
+        df_cat = category_slice(year_data, category)
+        title = f'{category} Progress Over Time - {selected_year}'
+
+        if window == 'reset':
+            return figure_patch(figure_entry(make_line_chart(df_cat, title, presorted=True)), 'graph')
+
+        # Only the zoomed window is sent, at full resolution up to the point cap
+        start, end = bounds
+        df_window = df_cat[(df_cat['Date'] >= start) & (df_cat['Date'] <= end)]
+        patch = Patch()
+        patch['data'] = make_line_chart(df_window, title, presorted=True)['data']
+        patch['layout']['xaxis']['range'] = [window[0], window[1]]
+        patch['layout']['xaxis']['autorange'] = False
+        if 'yaxis.range[0]' in relayout_data and 'yaxis.range[1]' in relayout_data:
+            patch['layout']['yaxis']['range'] = [relayout_data['yaxis.range[0]'], relayout_data['yaxis.range[1]']]
+            patch['layout']['yaxis']['autorange'] = False
+        return patch
+
+for category in CATEGORIES:
+    register_zoom_callback(category)
+
+# ============================== Metrics ========================== #
+
+def cache_collector():
+    """Figure cache lookups plus the age and size of each cached year, for /metrics"""
+    samples = [
+        ('counter', 'figure_cache_requests_total', {'result': 'hit'}, figure_cache.hits),
+        ('counter', 'figure_cache_requests_total', {'result': 'miss'}, figure_cache.misses),
+    ]
+    for year, year_data in list(_year_data.items()):
+        samples.append(('min', 'year_data_age_seconds', {'year': year}, time.monotonic() - year_data['loaded_at']))
+        samples.append(('max', 'year_data_rows', {'year': year}, len(year_data['df_sorted'])))
+    return samples
+
+metrics.add_collector(cache_collector)
+
+@server.before_request
+def start_callback_timer():
+    flask.g.request_start = time.perf_counter()
+
+@server.after_request
+def record_callback_metrics(response):
+    """Count and time Dash callback requests, labelled by the callback's first output"""
+    if flask.request.path.endswith('/_dash-update-component') and hasattr(flask.g, 'request_start'):
+        callback = callback_label()
+        metrics.observe('dash_callback_duration_seconds', time.perf_counter() - flask.g.request_start, callback=callback)
+        metrics.inc('dash_callback_requests_total', callback=callback, status=str(response.status_code))
+        if payloads.PAYLOAD_METRICS and response.status_code == 200:
+            payloads.record_outputs(callback, response.get_data())
+    return response
+
+@server.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text format metrics summed over every worker process"""
+    return flask.Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# ============================== Stage Timings ========================== #
+
+@server.route('/timings')
+def stage_timings():
+    """Rolling p50/p95/p99 per hot-path stage for this worker process"""
+    return percentiles()
+
+# ============================== Profiling ========================== #
+
+if profiling.PROFILING_ENABLED:
+    @server.before_request
+    def start_request_profile():
+        """Profile a Dash callback request flagged with X-Profile or ?profile="""
+        if flask.request.path.endswith('/_dash-update-component'):
+            kind = profiling.requested_profiler(flask.request)
+            if kind:
+                flask.g.profile = profiling.start_profile(kind)
+
+    @server.after_request
+    def save_request_profile(response):
+        profile = flask.g.pop('profile', None)
+        if profile is not None:
+            response.headers['X-Profile-File'] = profiling.finish_profile(profile, callback_label('callback'))
+        return response
+
+    @server.route('/profiles')
+    def saved_profiles():
+        """Saved request profiles, newest first"""
+        return flask.jsonify(profiling.list_profiles())
+
+    @server.route('/profiles/<path:file_name>')
+    def saved_profile(file_name):
+        return flask.send_from_directory(profiling.PROFILE_DIR, file_name, as_attachment=True)
+
+# ============================== Preloading ========================== #
+
+# gunicorn.conf.py imports the app once in the gunicorn master (PRELOAD_APP),
+# which loads PREWARM_YEARS and builds all their figures before forking.
+# Workers inherit the data, indexes and figure cache copy-on-write; both are
+# held in a few large NumPy arrays and JSON strings, so serving from them
+# barely dirties the shared pages.
+#
+# Every DATA_TTL_SECONDS a worker refetches the year, but if no category's
+# rows changed it keeps the data it has (refresh_year_data), so unchanged data
+# stays shared. Once the sheet changes, the worker summarizes the new rows in
+# memory of its own. With SHARED_DATA_BACKEND=arrow the new '#', Date and
+# Weight columns are memory-mapped from one snapshot file, which the line
+# charts and the table index read in place, so they stay shared through the
+# page cache (the text columns and the index's row orders are per worker);
+# otherwise every worker holds a private copy of the changed year.
+
+PREWARM_YEARS = [year.strip() for year in os.getenv('PREWARM_YEARS', 'All Time').split(',') if year.strip()]
+
+def prewarm(years=None):
+    """Load each year and build every category's figures into the figure cache"""
+    for year in years or PREWARM_YEARS:
+        year_data = get_year_data(year)
+        if year_data['df_sorted'].empty:
+            continue
+        cached_category_figures(year_data, CATEGORIES, year)
+
+def after_fork():
+    """Reset the state a worker forked from the preloaded master must not share with it"""
+    global _render_pool
+
+    # The master's fetches and builds are in its own metrics snapshot and timings
+    metrics.reset()
+    reset_timings()
+    figure_cache.hits = figure_cache.misses = 0
+
+    # Pool threads and processes aren't carried over by fork
+    _render_pool = None
+
+    # Nor may the master's keep-alive connections to the Sheets API be shared
+    if _client is not None:
+        _client.http_client.session.close()
 
 print(f"Serving Flask app '{current_file}'! 🚀")
 
@@ -0,0 +1,274 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import json
+import time
+import tempfile
+import threading
+from collections import defaultdict
+
+import psutil
+
+# ================================== Metrics ================================== #
+
+# Counters, histograms and gauges in Prometheus text format. Each process
+# keeps its own values in memory (one short lock per update) and writes a
+# snapshot to METRICS_DIR/<pid>.json at most every METRICS_FLUSH_SECONDS.
+# /metrics sums the snapshots of every live process, so all gunicorn workers
+# are counted whichever one serves the scrape. When a worker exits (or is
+# restarted by gunicorn), its counters and histograms are folded into
+# METRICS_DIR/exited.json and still counted, so the sums never go down and
+# Prometheus doesn't see a counter reset; its gauges are dropped.
+
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'jason_fitness_metrics'))
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '1'))
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTE_BUCKETS = (1000, 5000, 10000, 25000, 50000, 100000, 250000, 500000, 1000000, 2500000)
+
+# Histograms measured in something other than seconds
+HISTOGRAM_BUCKETS = {
+    'dash_output_bytes': BYTE_BUCKETS,
+    'dash_response_bytes': BYTE_BUCKETS,
+}
+
+# name: (type, help)
+METRICS = {
+    'dash_callback_requests_total': ('counter', 'Dash callback requests by callback and HTTP status'),
+    'dash_callback_duration_seconds': ('histogram', 'Dash callback request latency by callback'),
+    'sheets_api_calls_total': ('counter', 'Google Sheets worksheet fetches by worksheet'),
+    'sheets_api_errors_total': ('counter', 'Failed Google Sheets worksheet fetches by worksheet'),
+    'year_data_requests_total': ('counter', 'Year data lookups by result (hit or miss)'),
+    'shared_data_requests_total': ('counter', 'Shared year data snapshot lookups by result (hit, wait or fetch)'),
+    'figure_cache_requests_total': ('counter', 'Figure cache lookups by result (hit or miss)'),
+    'figure_cache_hit_ratio': ('gauge', 'Figure cache hits over lookups across all workers'),
+    'year_data_age_seconds': ('gauge', 'Age of the freshest cached data per year'),
+    'year_data_rows': ('gauge', 'Cleaned rows in the cached data per year'),
+    'process_resident_memory_bytes': ('gauge', 'Resident memory per worker process'),
+    'dash_output_bytes': ('histogram', 'Uncompressed JSON bytes per Dash callback output'),
+    'dash_response_bytes': ('histogram', 'Bytes sent per Dash response by callback and content encoding'),
+    'payload_budget_exceeded_total': ('counter', 'Outputs and responses over their byte budget'),
+}
+
+_counters = defaultdict(float)
+_histograms = {}
+_collectors = []
+_lock = threading.Lock()
+_last_flush = 0.0
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def inc(name, value=1, **labels):
+    """Add value to a counter"""
+    with _lock:
+        _counters[_key(name, labels)] += value
+    _maybe_flush()
+
+def _buckets(name):
+    return HISTOGRAM_BUCKETS.get(name, BUCKETS)
+
+def observe(name, value, **labels):
+    """Add one observation to a histogram"""
+    key = _key(name, labels)
+    buckets = _buckets(name)
+    with _lock:
+        histogram = _histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                histogram[0][i] += 1
+        histogram[1] += value
+        histogram[2] += 1
+    _maybe_flush()
+
+def add_collector(collector):
+    """Register a function returning (kind, name, labels, value) samples read at flush time
+
+    kind is 'counter' for cumulative per-process values, 'max' or 'min' for
+    gauges where the largest or smallest value across workers wins.
+    """
+    _collectors.append(collector)
+
+# ------------------------------- Snapshots ---------------------------------- #
+
+def _snapshot(collectors=True):
+    with _lock:
+        counters = [[name, dict(labels), value] for (name, labels), value in _counters.items()]
+        histograms = [[name, dict(labels), list(buckets), total, count] for (name, labels), (buckets, total, count) in _histograms.items()]
+    gauges = []
+    for collector in _collectors if collectors else ():
+        for kind, name, labels, value in collector():
+            if kind == 'counter':
+                counters.append([name, labels, value])
+            else:
+                gauges.append([name, labels, value, kind])
+    return {'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+def flush(collectors=True):
+    """Write this process's snapshot for the other workers to read
+
+    collectors=False leaves out collector samples, for a process (the gunicorn
+    master) whose gauges would otherwise stay frozen at this moment.
+    """
+    global _last_flush
+    _last_flush = time.monotonic()
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    _write_snapshot(os.path.join(METRICS_DIR, f'{os.getpid()}.json'), _snapshot(collectors))
+
+def reset():
+    """Forget this process's counters and histograms, as in a worker forked from a process that counted its own"""
+    global _last_flush
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+    _last_flush = 0.0
+
+def _maybe_flush():
+    if time.monotonic() - _last_flush >= METRICS_FLUSH_SECONDS:
+        try:
+            flush()
+        except OSError:
+            pass
+
+def _read_snapshot(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _write_snapshot(path, snapshot):
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+def _merge_exited(paths):
+    """Fold the counters and histograms of exited processes' snapshots into exited.json, then remove them"""
+    # filelock is only loaded once a worker has exited
+    from filelock import FileLock
+
+    exited_path = os.path.join(METRICS_DIR, 'exited.json')
+    # Another worker's scrape may find the same snapshots; only one merges each
+    with FileLock(os.path.join(METRICS_DIR, 'exited.lock')):
+        exited = _read_snapshot(exited_path) or {'counters': [], 'histograms': [], 'gauges': []}
+        counters = {_key(name, labels): value for name, labels, value in exited['counters']}
+        histograms = {_key(name, labels): [buckets, total, count] for name, labels, buckets, total, count in exited['histograms']}
+
+        merged = []
+        for path in paths:
+            snapshot = _read_snapshot(path)
+            if snapshot is None:
+                continue
+            for name, labels, value in snapshot['counters']:
+                key = _key(name, labels)
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, buckets, total, count in snapshot['histograms']:
+                histogram = histograms.setdefault(_key(name, labels), [[0] * len(buckets), 0.0, 0])
+                histogram[0] = [a + b for a, b in zip(histogram[0], buckets)]
+                histogram[1] += total
+                histogram[2] += count
+            merged.append(path)
+
+        if merged:
+            # Written before the snapshots go, so a crash in between can only count them twice
+            _write_snapshot(exited_path, {
+                'counters': [[name, dict(labels), value] for (name, labels), value in counters.items()],
+                'histograms': [[name, dict(labels), *histogram] for (name, labels), histogram in histograms.items()],
+                'gauges': [],
+            })
+            for path in merged:
+                os.remove(path)
+
+def _live_snapshots():
+    """Snapshots of every live process plus the totals of exited ones"""
+    snapshots = []
+    exited = []
+    for entry in os.scandir(METRICS_DIR):
+        # Only <pid>.json snapshots; anything else in the directory is left alone
+        name = entry.name[:-len('.json')]
+        if not entry.name.endswith('.json') or not (name.isascii() and name.isdigit()):
+            continue
+        if not psutil.pid_exists(int(name)):
+            exited.append(entry.path)
+            continue
+        snapshot = _read_snapshot(entry.path)
+        if snapshot is not None:
+            snapshots.append(snapshot)
+
+    if exited:
+        _merge_exited(exited)
+    snapshot = _read_snapshot(os.path.join(METRICS_DIR, 'exited.json'))
+    if snapshot is not None:
+        snapshots.append(snapshot)
+    return snapshots
+
+def clear():
+    """Remove every process's snapshot and the exited totals, for a server starting from zero"""
+    for entry in os.scandir(METRICS_DIR) if os.path.isdir(METRICS_DIR) else ():
+        if entry.name.endswith(('.json', '.tmp')):
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+# -------------------------------- Exposition -------------------------------- #
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+def render():
+    """All workers' metrics in Prometheus text exposition format"""
+    flush()
+
+    counters = defaultdict(float)
+    histograms = {}
+    gauges = {}
+    for snapshot in _live_snapshots():
+        for name, labels, value in snapshot['counters']:
+            counters[_key(name, labels)] += value
+        for name, labels, buckets, total, count in snapshot['histograms']:
+            merged = histograms.setdefault(_key(name, labels), [[0] * len(buckets), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += count
+        for name, labels, value, kind in snapshot['gauges']:
+            key = _key(name, labels)
+            if key not in gauges:
+                gauges[key] = value
+            else:
+                gauges[key] = max(gauges[key], value) if kind == 'max' else min(gauges[key], value)
+
+    # Figure cache hit ratio over every worker's lookups
+    hits = counters.get(_key('figure_cache_requests_total', {'result': 'hit'}), 0)
+    misses = counters.get(_key('figure_cache_requests_total', {'result': 'miss'}), 0)
+    if hits + misses:
+        gauges[_key('figure_cache_hit_ratio', {})] = hits / (hits + misses)
+
+    samples = defaultdict(list)
+    for (name, labels), value in sorted({**counters, **gauges}.items()):
+        samples[name].append(f'{name}{_format_labels(dict(labels))} {float(value)!r}')
+    for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+        labels = dict(labels)
+        for bound, bucket in zip(_buckets(name), buckets):
+            samples[name].append(f'{name}_bucket{_format_labels({**labels, "le": f"{bound:g}"})} {bucket}')
+        samples[name].append(f'{name}_bucket{_format_labels({**labels, "le": "+Inf"})} {count}')
+        samples[name].append(f'{name}_sum{_format_labels(labels)} {float(total)!r}')
+        samples[name].append(f'{name}_count{_format_labels(labels)} {count}')
+
+    lines = []
+    for name in sorted(samples):
+        metric_type, help_text = METRICS.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        lines.extend(samples[name])
+    return '\n'.join(lines) + '\n'
+
+def process_collector():
+    """Resident memory of this worker"""
+    return [('max', 'process_resident_memory_bytes', {'pid': str(os.getpid())}, psutil.Process().memory_info().rss)]
+
+add_collector(process_collector)
@@ -0,0 +1,73 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import json
+import time
+import logging
+
+import metrics
+import serialization
+
+# =============================== Payload Budgets ============================= #
+
+# Dash callback responses are measured per output before compression (figure
+# JSON, table pages) and as a whole on the wire after it. Sizes go to /metrics,
+# optionally to a JSON line per response with PAYLOAD_LOG, and any output or
+# response over its budget is logged as a warning.
+
+PAYLOAD_METRICS = os.getenv('PAYLOAD_METRICS', '1').lower() in ('1', 'true', 'yes')
+PAYLOAD_LOG = os.getenv('PAYLOAD_LOG', '0').lower() in ('1', 'true', 'yes')
+
+# Budgets in bytes of uncompressed JSON; 0 turns a budget off
+FIGURE_BUDGET_BYTES = int(os.getenv('FIGURE_BUDGET_BYTES', '150000'))
+TABLE_BUDGET_BYTES = int(os.getenv('TABLE_BUDGET_BYTES', '50000'))
+RESPONSE_BUDGET_BYTES = int(os.getenv('RESPONSE_BUDGET_BYTES', '500000'))
+
+logger = logging.getLogger('payloads')
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def budget(output):
+    """Byte budget for one 'id.property' output, or None"""
+    if output.endswith('.figure'):
+        return FIGURE_BUDGET_BYTES
+    if output == 'applications-table.data':
+        return TABLE_BUDGET_BYTES
+    return None
+
+def output_sizes(body):
+    """Uncompressed JSON bytes of each output in a Dash callback response body"""
+    try:
+        response = serialization.loads(body).get('response', {})
+    except (ValueError, AttributeError):
+        return {}
+    return {
+        f'{component_id}.{prop}': len(serialization.dumps(value))
+        for component_id, props in response.items()
+        for prop, value in props.items()
+    }
+
+def _over_budget(kind, name, size, limit):
+    metrics.inc('payload_budget_exceeded_total', kind=kind, output=name)
+    logger.warning(f'{kind} {name} is {size:,} bytes, over its {limit:,} byte budget')
+
+def record_outputs(callback, body):
+    """Account one uncompressed callback response, output by output"""
+    sizes = output_sizes(body)
+    for output, size in sizes.items():
+        metrics.observe('dash_output_bytes', size, output=output)
+        limit = budget(output)
+        if limit and size > limit:
+            _over_budget('output', output, size, limit)
+    if RESPONSE_BUDGET_BYTES and len(body) > RESPONSE_BUDGET_BYTES:
+        _over_budget('response', callback, len(body), RESPONSE_BUDGET_BYTES)
+    if PAYLOAD_LOG:
+        logger.info(json.dumps({'ts': time.time(), 'callback': callback, 'bytes': len(body), 'outputs': sizes}))
+
+def record_transfer(callback, size, encoding):
+    """Account the bytes one response put on the wire"""
+    metrics.observe('dash_response_bytes', size, callback=callback, encoding=encoding)
@@ -0,0 +1,110 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+import time
+import cProfile
+import threading
+from urllib.parse import urlparse, parse_qs
+
+# ================================= Profiling ================================= #
+
+# With PROFILING_ENABLED=1, a dashboard request flagged with an X-Profile
+# header (or loaded from a page URL with ?profile=...) runs under a profiler
+# and its output is saved under PROFILE_DIR:
+#
+#   X-Profile: 1 / cprofile   deterministic cProfile, saved as .prof (pstats)
+#   X-Profile: pyinstrument   sampling pyinstrument, saved as .speedscope.json
+#
+# Profilers hook the whole interpreter, so only one request is profiled at a
+# time; flagged requests that arrive meanwhile run unprofiled.
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '0').lower() in ('1', 'true', 'yes')
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.profiles'))
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+_active = threading.Lock()
+
+def requested_profiler(request):
+    """Profiler a request asks for ('cprofile' or 'pyinstrument'), or None"""
+    flag = request.headers.get('X-Profile') or request.args.get('profile')
+    if not flag and request.referrer:
+        # Dash callbacks are posted by the page, which carries the query string
+        flag = parse_qs(urlparse(request.referrer).query).get('profile', [None])[0]
+    if not flag or flag.lower() in ('0', 'false', 'no'):
+        return None
+    flag = flag.lower()
+    return flag if flag in PROFILERS else 'cprofile'
+
+class RequestProfile:
+    """A profiler running for one request"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        if kind == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+                self.profiler = Profiler()
+            except ImportError:
+                print("⚠️ pyinstrument is not installed, profiling with cProfile")
+                self.kind = 'cprofile'
+        if self.kind == 'cprofile':
+            self.profiler = cProfile.Profile()
+
+    def start(self):
+        if self.kind == 'pyinstrument':
+            self.profiler.start()
+        else:
+            self.profiler.enable()
+
+    def stop_and_save(self, label):
+        """Stop profiling and write the output to PROFILE_DIR, returning its file name"""
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        safe_label = re.sub(r'[^A-Za-z0-9_.-]', '_', label)[:80]
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{safe_label}"
+
+        if self.kind == 'pyinstrument':
+            from pyinstrument.renderers import SpeedscopeRenderer
+            self.profiler.stop()
+            file_name = f'{stem}.speedscope.json'
+            with open(os.path.join(PROFILE_DIR, file_name), 'w', encoding='utf-8') as f:
+                f.write(self.profiler.output(renderer=SpeedscopeRenderer()))
+        else:
+            self.profiler.disable()
+            file_name = f'{stem}.prof'
+            self.profiler.dump_stats(os.path.join(PROFILE_DIR, file_name))
+        return file_name
+
+def start_profile(kind):
+    """A started RequestProfile, or None if another request is being profiled"""
+    if not _active.acquire(blocking=False):
+        return None
+    try:
+        profile = RequestProfile(kind)
+        profile.start()
+    except Exception:
+        _active.release()
+        raise
+    return profile
+
+def finish_profile(profile, label):
+    """Save a RequestProfile started by start_profile and let the next request profile"""
+    try:
+        return profile.stop_and_save(label)
+    finally:
+        _active.release()
+
+def list_profiles():
+    """Saved profiles, newest first"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    entries = [entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(('.prof', '.speedscope.json'))]
+    return [
+        {
+            'name': entry.name,
+            'bytes': entry.stat().st_size,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(entry.stat().st_mtime)),
+        }
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime, reverse=True)
+    ]
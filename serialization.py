@@ -0,0 +1,78 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import json
+
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ============================ JSON Serialization ============================ #
+
+# Cached figure JSON and Dash callback responses (which Dash encodes with
+# plotly.io.json) go through orjson when it is installed. orjson encodes NumPy
+# float and datetime64 arrays in C rather than one element at a time, and
+# figure data that is already encoded rides along in responses as an
+# orjson.Fragment instead of being decoded and encoded again.
+# JSON_ENGINE=json forces the standard library encoder.
+
+JSON_ENGINE = os.getenv('JSON_ENGINE', 'auto').lower()
+if JSON_ENGINE == 'orjson' and orjson is None:
+    print('orjson is not installed, so JSON is encoded with the json module')
+if JSON_ENGINE not in ('json', 'orjson') or orjson is None:
+    JSON_ENGINE = 'orjson' if orjson is not None else 'json'
+
+pio.json.config.default_engine = JSON_ENGINE
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+def _default(value):
+    """Encodings for the few non-native values inside plain containers, matching plotly's"""
+    if hasattr(value, 'isoformat'):
+        # pandas Timestamps, as in table records
+        return value.isoformat()
+    if hasattr(value, 'tolist'):
+        # NumPy scalars
+        return value.tolist()
+    raise TypeError
+
+def dumps(value) -> bytes:
+    """UTF-8 JSON for plain values and C-contiguous NumPy arrays"""
+    if JSON_ENGINE == 'orjson':
+        try:
+            return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # Strided arrays, pandas objects and the like take plotly's path
+            pass
+    return to_json_plotly(value).encode()
+
+def dumps_figure(fig: dict) -> str:
+    """JSON string for a figure dict, as kept in the figure cache"""
+    if JSON_ENGINE == 'orjson':
+        return dumps(fig).decode()
+    return to_json_plotly(fig)
+
+def loads(text):
+    return orjson.loads(text) if JSON_ENGINE == 'orjson' else json.loads(text)
+
+def preencoded(value):
+    """value as something Dash writes into a response without walking it again"""
+    if JSON_ENGINE == 'orjson':
+        return orjson.Fragment(dumps(value))
+    return value
+
+def dumps_split(head: dict, body) -> str:
+    """head and body as two JSON lines, so loads_split can pass body on without parsing it"""
+    # Compact JSON has no raw newlines, so the first one ends head
+    return (dumps(head) + b'\n' + dumps(body)).decode()
+
+def loads_split(text):
+    """(head, body) from dumps_split text, with body ready to write into a response as is"""
+    head, body = text.split('\n', 1)
+    if JSON_ENGINE == 'orjson':
+        return loads(head), orjson.Fragment(body)
+    return loads(head), loads(body)
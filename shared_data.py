@@ -0,0 +1,195 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+import math
+import time
+import tempfile
+from contextlib import contextmanager
+
+import metrics
+
+# ============================== Shared Year Data ============================= #
+
+# Every gunicorn worker keeps its own year data, so without a shared tier each
+# one fetches every sheet itself. SHARED_DATA_BACKEND puts a host-wide (or,
+# with Redis, deployment-wide) snapshot of each year's cleaned long frame in
+# front of the Sheets API:
+#
+#   arrow  one Arrow IPC file per year in SHARED_DATA_DIR. Workers memory-map
+#          it, so the numeric and date columns are views over the page cache
+#          rather than copies; only the text columns are decoded per worker.
+#          The app writes its rows already in line chart order and indexes
+#          the table with row orders over them, so the mapped frame is used
+#          as it is rather than reordered into private copies.
+#   redis  the same Arrow data as one value per year at SHARED_DATA_REDIS_URL.
+#
+# A snapshot is served until it is DATA_TTL_SECONDS old. The first worker to
+# find it stale takes the year's lock (a file lock, or a Redis lock that
+# expires if its holder dies), fetches and writes a new one; workers that
+# waited on the lock read that snapshot instead of fetching again.
+
+SHARED_DATA_BACKEND = os.getenv('SHARED_DATA_BACKEND', 'none').lower()
+SHARED_DATA_DIR = os.getenv('SHARED_DATA_DIR', os.path.join(tempfile.gettempdir(), 'jason_fitness_data'))
+SHARED_DATA_REDIS_URL = os.getenv('SHARED_DATA_REDIS_URL', 'redis://localhost:6379/0')
+SHARED_DATA_LOCK_TIMEOUT = float(os.getenv('SHARED_DATA_LOCK_TIMEOUT', '60'))
+
+def _year_name(year):
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', year)
+
+def _to_table(df, fetched_at):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return table.replace_schema_metadata({**table.schema.metadata, b'fetched_at': repr(fetched_at).encode()})
+
+def _from_table(table):
+    """The cleaned frame in a snapshot and when it was fetched (time.time())"""
+    # split_blocks keeps each column its own block, so numeric and date
+    # columns stay zero-copy views of the Arrow buffers
+    return table.to_pandas(split_blocks=True), float(table.schema.metadata[b'fetched_at'])
+
+class ArrowFileBackend:
+    """Memory-mapped Arrow IPC snapshots in a directory, one file per year"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, year):
+        return os.path.join(self.directory, _year_name(year) + '.arrow')
+
+    def read(self, year):
+        import pyarrow as pa
+
+        try:
+            source = pa.memory_map(self._path(year))
+        except FileNotFoundError:
+            return None
+        return _from_table(pa.ipc.open_file(source).read_all())
+
+    def write(self, year, df, fetched_at):
+        import pyarrow as pa
+
+        table = _to_table(df, fetched_at)
+
+        # Write then rename so readers never map a partial file; workers still
+        # holding the old one keep their mapping until they let go of it
+        path = self._path(year)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def lock(self, year):
+        """True while this process holds the year's refresh lock, False if it timed out"""
+        from filelock import FileLock, Timeout
+
+        lock = FileLock(self._path(year) + '.lock')
+        try:
+            lock.acquire(timeout=SHARED_DATA_LOCK_TIMEOUT)
+        except Timeout:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            lock.release()
+
+class RedisBackend:
+    """Arrow IPC snapshots stored as Redis values, one key per year"""
+
+    def __init__(self, url, ttl):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        # Stale snapshots are never served, so let Redis drop them soon after
+        self.expire = max(1, math.ceil(ttl * 2))
+
+    def _key(self, year):
+        return f'jason_fitness:year_data:{_year_name(year)}'
+
+    def read(self, year):
+        import pyarrow as pa
+
+        payload = self.client.get(self._key(year))
+        if payload is None:
+            return None
+        return _from_table(pa.ipc.open_stream(pa.py_buffer(payload)).read_all())
+
+    def write(self, year, df, fetched_at):
+        import pyarrow as pa
+
+        table = _to_table(df, fetched_at)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        self.client.set(self._key(year), sink.getvalue().to_pybytes(), ex=self.expire)
+
+    @contextmanager
+    def lock(self, year):
+        """True while this process holds the year's refresh lock, False if it timed out"""
+        from redis.exceptions import LockError
+
+        lock = self.client.lock(self._key(year) + ':lock', timeout=SHARED_DATA_LOCK_TIMEOUT)
+        if not lock.acquire(blocking_timeout=SHARED_DATA_LOCK_TIMEOUT):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                # Held past its timeout and already expired
+                pass
+
+class SharedYearData:
+    """Cleaned year frames shared by every worker through a snapshot backend"""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+
+    def _fresh(self, year):
+        snapshot = self.backend.read(year)
+        if snapshot is not None and time.time() - snapshot[1] < self.ttl:
+            return snapshot
+        return None
+
+    def load(self, year, fetch):
+        """year's cleaned frame and when it was fetched, calling fetch() only if no worker has a fresh snapshot"""
+        snapshot = self._fresh(year)
+        if snapshot is not None:
+            metrics.inc('shared_data_requests_total', result='hit')
+            return snapshot
+
+        with self.backend.lock(year) as locked:
+            if locked:
+                # Another worker may have refreshed it while this one waited
+                snapshot = self._fresh(year)
+                if snapshot is not None:
+                    metrics.inc('shared_data_requests_total', result='wait')
+                    return snapshot
+            else:
+                print(f"⚠️ Timed out waiting for the shared {year} data lock, fetching without it")
+
+            metrics.inc('shared_data_requests_total', result='fetch')
+            fetched_at = time.time()
+            df = fetch()
+            # Don't share a failed or empty fetch
+            if locked and not df.empty:
+                self.backend.write(year, df, fetched_at)
+            return df, fetched_at
+
+def create_shared_data(ttl):
+    """Shared year data configured from SHARED_DATA_BACKEND, or None when each worker fetches its own"""
+    if SHARED_DATA_BACKEND == 'none':
+        return None
+    if SHARED_DATA_BACKEND == 'arrow':
+        return SharedYearData(ArrowFileBackend(SHARED_DATA_DIR), ttl)
+    if SHARED_DATA_BACKEND == 'redis':
+        return SharedYearData(RedisBackend(SHARED_DATA_REDIS_URL, ttl), ttl)
+    raise ValueError(f"Unknown SHARED_DATA_BACKEND: {SHARED_DATA_BACKEND!r} (expected 'none', 'arrow' or 'redis')")
@@ -0,0 +1,301 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import re
+import math
+import operator
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from pandas.errors import OutOfBoundsDatetime
+
+# =============================== Table Queries =============================== #
+
+# applications-table is paged, sorted and filtered on the server
+# (page_action='custom'), so only the rows on screen cross the wire. The
+# DataTable sends its page, its sort_by list and its filter row as a
+# filter_query string such as
+#
+#   {Exercise} icontains bench && {Weight} >= 135 && {Date} datestartswith 2024-03
+#
+# Each && part compares one column to one value. Parts this can't read match
+# every row, the same as the native filter ignoring an invalid expression.
+#
+# Every keystroke in the filter row is a query, so each year's table frame is
+# indexed once (TableIndex): numeric and date columns keep a stable sort order
+# for searchsorted range scans, text columns are factorized so a part is
+# evaluated once per distinct value, and recent results are kept in an LRU.
+# The index only holds row orders over the frame, never a reordered copy of
+# it, so the frame's rows may be in any order (the app keeps them sorted for
+# its line charts); unsorted, the table lists them by ROW_NUMBER_COLUMN.
+
+TABLE_PAGE_SIZE = 20
+ROW_NUMBER_COLUMN = '#'
+TABLE_QUERY_CACHE_SIZE = int(os.getenv('TABLE_QUERY_CACHE_SIZE', '32'))
+
+# DataTable column types, which also pick the filter row's default operator
+COLUMN_TYPES = {'#': 'numeric', 'Date': 'datetime', 'Category': 'text', 'Exercise': 'text', 'Weight': 'numeric'}
+
+# Operators may carry an i (case-insensitive) or s (case-sensitive) prefix
+_FILTER_PART = re.compile(
+    r'^\s*\{(?P<column>[^}]+)\}\s+(?P<case>[is]?)'
+    r'(?P<operator>contains|datestartswith|eq|ne|lt|le|gt|ge|!=|<=|>=|[<>=])\s*(?P<value>.*?)\s*$'
+)
+
+SYMBOLS = {'=': 'eq', '!=': 'ne', '<': 'lt', '<=': 'le', '>': 'gt', '>=': 'ge'}
+
+COMPARISONS = {'eq': operator.eq, 'ne': operator.ne, 'lt': operator.lt, 'le': operator.le, 'gt': operator.gt, 'ge': operator.ge}
+
+@lru_cache(maxsize=256)
+def parse_filter(filter_query):
+    """(column, operator, value) for each && part of a filter_query, skipping unreadable parts"""
+    parts = []
+    for part in (filter_query or '').split(' && '):
+        match = _FILTER_PART.match(part)
+        if not match:
+            continue
+        operator_name = SYMBOLS.get(match.group('operator'), match.group('operator'))
+        if match.group('case') == 'i' and operator_name != 'datestartswith':
+            operator_name = 'i' + operator_name
+        value = match.group('value')
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'`':
+            value = value[1:-1]
+        parts.append((match.group('column'), operator_name, value))
+    return tuple(parts)
+
+def date_prefix_range(value):
+    """[start, end) of the dates whose ISO form starts with value ('2024', '2024-03', '2024-03-05'), end None past 9999"""
+    try:
+        start = pd.Timestamp(value)
+    except ValueError:
+        return None
+    digits = len(value.split('T')[0])
+    if digits <= 4:
+        offset = pd.DateOffset(years=1)
+    elif digits <= 7:
+        offset = pd.DateOffset(months=1)
+    else:
+        offset = pd.DateOffset(days=1)
+    try:
+        return start, start + offset
+    except (ValueError, OverflowError):
+        return start, None
+
+def ns_datetime(timestamp):
+    """timestamp as a datetime64[ns] bound for the Date column, or None outside 1677-2262"""
+    # pd.Timestamp parses to seconds; searchsorted against the ns column would
+    # wrap a date ns can't hold instead of comparing it
+    try:
+        return timestamp.as_unit('ns').to_datetime64()
+    except OutOfBoundsDatetime:
+        return None
+
+class TableIndex:
+    """Column indexes over one year's table frame, with an LRU of recent query results"""
+
+    def __init__(self, df):
+        self.df = df
+        self.size = len(df)
+        self.codes = {}
+        self.labels = {}
+        self.values = {}
+        self.orders = {}
+
+        # Table order; every other order breaks ties by it
+        if ROW_NUMBER_COLUMN in df.columns:
+            self.row_order = np.argsort(df[ROW_NUMBER_COLUMN].to_numpy(), kind='stable')
+        else:
+            self.row_order = np.arange(self.size)
+
+        for column in df.columns:
+            if COLUMN_TYPES.get(column, 'text') == 'text':
+                # Codes follow the sorted labels, so they also sort the column
+                codes, labels = pd.factorize(df[column], sort=True)
+                self.codes[column] = codes
+                self.labels[column] = np.asarray(labels, dtype=object)
+            else:
+                # A view of the frame's column, which may be a shared mapping
+                self.values[column] = df[column].to_numpy()
+            self.sort_order(column)
+
+        self._init_results()
+
+    def _init_results(self):
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Background jobs hand year data over pickled; the results cache stays behind
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_results'], state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_results()
+
+    # ------------------------------- Filtering ------------------------------ #
+
+    def _range_mask(self, column, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        """Rows whose value lies between low and high, from one range of the column's sort order"""
+        values, order = self.values[column], self.orders[column, False]
+        start = 0 if low is None else np.searchsorted(values, low, side='left' if low_inclusive else 'right', sorter=order)
+        end = self.size if high is None else np.searchsorted(values, high, side='right' if high_inclusive else 'left', sorter=order)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[order[start:end]] = True
+        return mask
+
+    def _ordered_mask(self, column, operator_name, value):
+        """Relational comparison on a numeric or date column as range scans"""
+        if operator_name == 'eq':
+            return self._range_mask(column, value, value)
+        if operator_name == 'ne':
+            return ~self._range_mask(column, value, value)
+        if operator_name in ('lt', 'le'):
+            return self._range_mask(column, high=value, high_inclusive=operator_name == 'le')
+        return self._range_mask(column, low=value, low_inclusive=operator_name == 'ge')
+
+    def _out_of_range_mask(self, operator_name, after):
+        """Relational comparison against a date before (or after) every date in the column"""
+        if operator_name == 'eq':
+            return np.zeros(self.size, dtype=bool)
+        if operator_name == 'ne' or (operator_name in ('lt', 'le')) == after:
+            return None
+        return np.zeros(self.size, dtype=bool)
+
+    def _label_mask(self, column, operator_name, value):
+        """Evaluate a part once per distinct label and map it back to rows through the codes"""
+        labels = self.labels[column]
+        if operator_name in ('contains', 'icontains'):
+            matches = pd.Series(labels, dtype=object).str.contains(value, case=operator_name == 'contains', regex=False).to_numpy(dtype=bool)
+        elif operator_name == 'datestartswith':
+            matches = pd.Series(labels, dtype=object).str.startswith(value).to_numpy(dtype=bool)
+        else:
+            compare = COMPARISONS.get(operator_name.lstrip('i'))
+            if compare is None:
+                return None
+            if operator_name.startswith('i'):
+                labels, value = pd.Series(labels, dtype=object).str.lower().to_numpy(dtype=object), value.lower()
+            matches = np.fromiter((compare(label, value) for label in labels), dtype=bool, count=len(labels))
+        return matches[self.codes[column]]
+
+    def part_mask(self, column, operator_name, value):
+        """Boolean mask of the rows matching one filter part, or None when it matches all of them"""
+        if column in self.codes:
+            return self._label_mask(column, operator_name, value)
+
+        column_type = COLUMN_TYPES.get(column)
+        if operator_name in ('contains', 'icontains') or (operator_name == 'datestartswith' and column_type != 'datetime'):
+            # Substring matches on numbers and dates go through their text form
+            strings = self.df[column].astype(str).str
+            if operator_name == 'datestartswith':
+                return strings.startswith(value).to_numpy(dtype=bool)
+            return strings.contains(value, case=operator_name == 'contains', regex=False).to_numpy(dtype=bool)
+
+        if column_type == 'datetime':
+            if operator_name == 'datestartswith':
+                bounds = date_prefix_range(value)
+                if bounds is None or bounds[0] > pd.Timestamp.max or (bounds[1] is not None and bounds[1] <= pd.Timestamp.min):
+                    return np.zeros(self.size, dtype=bool)
+                # A bound past the column's range leaves that side open
+                low, high = ns_datetime(bounds[0]), None if bounds[1] is None else ns_datetime(bounds[1])
+                return self._range_mask(column, low, high, high_inclusive=False)
+            try:
+                timestamp = pd.Timestamp(value)
+            except ValueError:
+                return np.zeros(self.size, dtype=bool)
+            if timestamp is pd.NaT:
+                return np.zeros(self.size, dtype=bool)
+            value = ns_datetime(timestamp)
+        else:
+            try:
+                value = float(value)
+            except ValueError:
+                return np.zeros(self.size, dtype=bool)
+
+        operator_name = operator_name.lstrip('i')
+        if operator_name not in COMPARISONS:
+            return None
+        if value is None:
+            # A date before or after everything the column can hold
+            return self._out_of_range_mask(operator_name, after=timestamp > pd.Timestamp.max)
+        return self._ordered_mask(column, operator_name, value)
+
+    def filter_mask(self, filter_query):
+        """Rows matching every part of filter_query, or None when that is all of them"""
+        mask = None
+        for column, operator_name, value in parse_filter(filter_query or ''):
+            if column not in self.df.columns:
+                continue
+            part = self.part_mask(column, operator_name, value)
+            if part is not None:
+                mask = part if mask is None else mask & part
+        return mask
+
+    # -------------------------------- Sorting ------------------------------- #
+
+    def _sort_key(self, column, descending):
+        key = self.codes[column] if column in self.codes else self.values[column]
+        if key.dtype.kind == 'M':
+            key = key.view('i8')
+        return -key if descending else key
+
+    def sort_order(self, column, descending=False):
+        """Stable row order for one sort column, ties kept in table order"""
+        order = self.orders.get((column, descending))
+        if order is None:
+            order = self.row_order[np.argsort(self._sort_key(column, descending)[self.row_order], kind='stable')]
+            self.orders[column, descending] = order
+        return order
+
+    def _sorted_rows(self, mask, sort_key):
+        if len(sort_key) <= 1:
+            order = self.sort_order(*sort_key[0]) if sort_key else self.row_order
+            return order if mask is None else order[mask[order]]
+        rows = self.row_order if mask is None else self.row_order[mask[self.row_order]]
+        # lexsort's primary key is its last
+        keys = [self._sort_key(column, descending)[rows] for column, descending in reversed(sort_key)]
+        return rows[np.lexsort(keys)]
+
+    # -------------------------------- Queries ------------------------------- #
+
+    def clear(self):
+        """Drop the cached query results"""
+        with self._lock:
+            self._results.clear()
+
+    def query(self, filter_query='', sort_by=None):
+        """Row positions matching filter_query in sort_by order"""
+        # sort_by can come from a request (the export routes), so anything but
+        # a known column name is ignored rather than looked up
+        sort_key = tuple(
+            (item['column_id'], item.get('direction') == 'desc')
+            for item in sort_by or []
+            if isinstance(item.get('column_id'), str) and item['column_id'] in self.df.columns
+        )
+        key = (filter_query or '', sort_key)
+        with self._lock:
+            rows = self._results.get(key)
+            if rows is not None:
+                self._results.move_to_end(key)
+                return rows
+
+        rows = self._sorted_rows(self.filter_mask(filter_query), sort_key)
+
+        with self._lock:
+            self._results[key] = rows
+            while len(self._results) > TABLE_QUERY_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return rows
+
+def table_page(index, page_current=0, page_size=TABLE_PAGE_SIZE, sort_by=None, filter_query=''):
+    """Records on one page of the filtered, sorted table, the page count and the page actually shown"""
+    page_size = page_size or TABLE_PAGE_SIZE
+    rows = index.query(filter_query, sort_by)
+    page_count = max(1, math.ceil(len(rows) / page_size))
+    page_current = min(max(page_current or 0, 0), page_count - 1)
+    start = page_current * page_size
+    return index.df.iloc[rows[start:start + page_size]].to_dict('records'), page_count, page_current
@@ -0,0 +1,65 @@
+# =================================== IMPORTS ================================= #
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# ================================ Stage Timing =============================== #
+
+# Hot-path stages (sheet fetch, parse, reshape, aggregate, figure build,
+# serialize, whole callbacks) are timed with a monotonic clock. Every timing
+# goes into a rolling window per stage for p50/p95/p99, and is logged as one
+# JSON line when TIMING_LOG is on.
+
+TIMING_LOG = os.getenv('TIMING_LOG', '0').lower() in ('1', 'true', 'yes')
+TIMING_WINDOW = int(os.getenv('TIMING_WINDOW', '1000'))
+
+logger = logging.getLogger('timing')
+if TIMING_LOG and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_samples = defaultdict(lambda: deque(maxlen=TIMING_WINDOW))
+_samples_lock = threading.Lock()
+
+def record(stage, seconds, **fields):
+    """Add one timing for stage and log it"""
+    with _samples_lock:
+        _samples[stage].append(seconds)
+    if TIMING_LOG:
+        logger.info(json.dumps({'ts': time.time(), 'stage': stage, 'ms': round(seconds * 1e3, 3), **fields}, default=str))
+
+@contextmanager
+def timed(stage, **fields):
+    """Time the enclosed block (or decorated function) as one sample of stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, **fields)
+
+def reset():
+    """Forget every stage's samples, as in a worker forked from a process that timed its own"""
+    with _samples_lock:
+        _samples.clear()
+
+def percentiles():
+    """Sample count and p50/p95/p99 in milliseconds per stage over its rolling window"""
+    with _samples_lock:
+        snapshot = {stage: np.array(samples) for stage, samples in _samples.items() if samples}
+    return {
+        stage: {
+            'count': len(samples),
+            **dict(zip(('p50', 'p95', 'p99'), np.round(np.percentile(samples, [50, 95, 99]) * 1e3, 3).tolist())),
+        }
+        for stage, samples in sorted(snapshot.items())
+    }